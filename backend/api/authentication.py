@@ -0,0 +1,46 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+
+def token_cache_key(key):
+    return f'auth-token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def forget_tokens(keys):
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication, кеширующая токен вместе с пользователем.
+
+    Хеш пароля в кеш не попадает: поле откладывается и при обращении
+    загружается из БД. Кеш сбрасывается сигналами при удалении токена и
+    при любом сохранении пользователя (смена пароля, блокировка и т.д.).
+    """
+
+    def get_token(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').defer(
+                'user__password'
+            ).get(key=key)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        return token
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            token = self.get_token(key)
+            cache.set(cache_key, token, settings.TOKEN_CACHE_TIMEOUT)
+        if token.user.is_blocked:
+            raise AuthenticationFailed('Пользователь заблокирован.')
+        return token.user, token
@@ -0,0 +1,100 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from api.constants import CACHED_QUERY_PARAMS
+
+INGREDIENTS = 'ingredients'
+RECIPES = 'recipes'
+TAGS = 'tags'
+
+
+def user_state(user_id):
+    return f'user-state:{user_id}'
+
+
+def shopping_cart(user_id):
+    return f'shopping-cart:{user_id}'
+
+
+def get_version(namespace):
+    return cache.get_or_set(f'{namespace}:version', time.time, None)
+
+
+def bump_version(namespace):
+    cache.set(f'{namespace}:version', time.time(), None)
+
+
+def is_shared_between_processes():
+    return not isinstance(caches['default'], (DummyCache, LocMemCache))
+
+
+def versioned_key(prefix, *namespaces):
+    return ':'.join(
+        [prefix, *(str(get_version(namespace)) for namespace in namespaces)]
+    )
+
+
+def get_response_cache_key(request, namespace):
+    if request.user.is_authenticated:
+        return None
+    if not set(request.query_params).issubset(CACHED_QUERY_PARAMS):
+        return None
+    params = '&'.join(
+        f'{name}={",".join(sorted(set(request.query_params.getlist(name))))}'
+        for name in sorted(request.query_params)
+    )
+    url = request.build_absolute_uri(request.path)
+    digest = hashlib.md5(f'{url}?{params}'.encode()).hexdigest()
+    return f'{namespace}:{get_version(namespace)}:{digest}'
+
+
+def cache_anonymous_response(namespace):
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = get_response_cache_key(request, namespace)
+            if key is None:
+                return view_method(self, request, *args, **kwargs)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional_get(get_namespaces):
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            versions = {
+                namespace: get_version(namespace)
+                for namespace in get_namespaces(request)
+            }
+            digest = hashlib.md5(repr(sorted(versions.items())).encode())
+            etag = f'"{digest.hexdigest()}"'
+            last_modified = int(max(versions.values()))
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+                patch_vary_headers(response, ('Authorization',))
+            return response
+        return wrapper
+    return decorator
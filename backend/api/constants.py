@@ -1,4 +1,23 @@
 PDFFONTIZE = 12
 PDFTEXTBEGINX = 40
 PDFTEXTBEGINY = 760
+PDFTEXTENDY = 60
 PDFHEADBEGINY = 800
+PDFFOOTERY = 30
+PDFLINEHEIGHT = 16
+PDFCACHEMAXSIZE = 1024 * 1024
+PDFSPOOLSIZE = 1024 * 1024
+MAX_PAGE_SIZE = 100
+CACHED_QUERY_PARAMS = (
+    'author',
+    'cursor',
+    'image_format',
+    'image_size',
+    'limit',
+    'page',
+    'search',
+    'tags'
+)
+IMAGE_SIZES = {'small': 320, 'medium': 800}
+IMAGE_FORMATS = {'webp': ('WEBP', 'webp'), 'jpeg': ('JPEG', 'jpg')}
+IMAGE_QUALITY = 85
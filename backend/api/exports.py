@@ -0,0 +1,63 @@
+import csv
+import json
+
+from django.db.models import Sum
+
+from recipes.models import RecipeIngredient
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def get_shopping_cart_ingredients(user):
+    return RecipeIngredient.objects.filter(
+        recipe__shopping_list__user=user
+    ).order_by('ingredient__name').values(
+        'ingredient__name', 'ingredient__measurement_unit'
+    ).annotate(total_amount=Sum('amount'))
+
+
+def format_line(item):
+    return (
+        f'{item["ingredient__name"]} '
+        f'({item["ingredient__measurement_unit"]}) - '
+        f'{item["total_amount"]}'
+    )
+
+
+def stream_txt(ingredients):
+    for item in ingredients.iterator():
+        yield format_line(item) + '\n'
+
+
+def stream_csv(ingredients):
+    writer = csv.writer(Echo())
+    yield writer.writerow(('name', 'measurement_unit', 'amount'))
+    for item in ingredients.iterator():
+        yield writer.writerow((
+            item['ingredient__name'],
+            item['ingredient__measurement_unit'],
+            item['total_amount']
+        ))
+
+
+def stream_json(ingredients):
+    separator = ''
+    yield '['
+    for item in ingredients.iterator():
+        yield separator + json.dumps({
+            'name': item['ingredient__name'],
+            'measurement_unit': item['ingredient__measurement_unit'],
+            'amount': item['total_amount'],
+        }, ensure_ascii=False)
+        separator = ','
+    yield ']'
+
+
+EXPORTERS = {
+    'txt': stream_txt,
+    'csv': stream_csv,
+    'json': stream_json,
+}
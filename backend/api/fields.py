@@ -1,13 +1,44 @@
 import base64
 
+from django.conf import settings
 from django.core.files.base import ContentFile
+from django.template.defaultfilters import filesizeformat
 from rest_framework import serializers
 
+from api.constants import IMAGE_FORMATS, IMAGE_SIZES
+from api.images import derivative_name, has_derivatives, strip_metadata
+
 
 class Base64ImageField(serializers.ImageField):
+    default_error_messages = {
+        'too_large': 'Размер изображения не должен превышать {max_size}.',
+    }
+
+    def check_size(self, size):
+        if size > settings.MAX_IMAGE_UPLOAD_SIZE:
+            self.fail(
+                'too_large',
+                max_size=filesizeformat(settings.MAX_IMAGE_UPLOAD_SIZE)
+            )
+
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
             format, imgstr = data.split(';base64,')
+            self.check_size(len(imgstr) * 3 // 4)
             ext = format.split('/')[-1]
             data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
-        return super().to_internal_value(data)
+        elif hasattr(data, 'size'):
+            self.check_size(data.size)
+        return strip_metadata(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        size = request and request.query_params.get('image_size')
+        if size not in IMAGE_SIZES or not has_derivatives(value):
+            return super().to_representation(value)
+        image_format = request.query_params.get('image_format', 'webp')
+        if image_format not in IMAGE_FORMATS:
+            image_format = 'webp'
+        return request.build_absolute_uri(value.storage.url(
+            derivative_name(value.name, size, image_format)
+        ))
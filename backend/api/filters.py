@@ -1,6 +1,9 @@
+from django.conf import settings
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
-from recipes.models import Ingredient, Tag
+from api.ingredient_index import ingredient_index
+from recipes.models import Ingredient, RecipeTag, Tag
 from users.models import User
 
 
@@ -8,11 +11,23 @@ class RecipeFilter(filters.FilterSet):
     tags = filters.ModelMultipleChoiceFilter(
         queryset=Tag.objects.all(),
         field_name='tags__slug',
-        to_field_name='slug'
+        to_field_name='slug',
+        method='filter_tags'
     )
     author = filters.ModelChoiceFilter(queryset=User.objects.all())
     is_favorited = filters.CharFilter(method='get_favorited',)
     is_in_shopping_cart = filters.CharFilter(method='get_shopping_cart',)
+    search = filters.CharFilter(method='filter_search')
+
+    def filter_tags(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(Exists(RecipeTag.objects.filter(
+            recipe=OuterRef('pk'), tags__in=value
+        )))
+
+    def filter_search(self, queryset, name, value):
+        return queryset.search(value)
 
     def get_favorited(self, queryset, name, value):
         if value:
@@ -33,6 +48,6 @@ class IngredientFilter(filters.FilterSet):
         fields = ('name', )
 
     def filter_name(self, queryset, name, value):
-        return queryset.filter(
-            name__istartswith=value
-        )
+        return queryset.filter(pk__in=ingredient_index.search(
+            value, settings.INGREDIENT_SEARCH_LIMIT
+        ))
@@ -0,0 +1,92 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from api.constants import IMAGE_FORMATS, IMAGE_QUALITY, IMAGE_SIZES
+
+
+def derivative_name(name, size, image_format):
+    root, _ = os.path.splitext(name)
+    return f'{root}_{IMAGE_SIZES[size]}.{IMAGE_FORMATS[image_format][1]}'
+
+
+def derivative_names(name):
+    return [
+        derivative_name(name, size, image_format)
+        for size in IMAGE_SIZES
+        for image_format in IMAGE_FORMATS
+    ]
+
+
+def derivative_source_prefix(name):
+    """Начало имени оригинала, если name - имя уменьшенной копии."""
+    root, extension = os.path.splitext(name)
+    if extension[1:] not in {ext for _, ext in IMAGE_FORMATS.values()}:
+        return None
+    for width in IMAGE_SIZES.values():
+        if root.endswith(f'_{width}'):
+            return f'{root[:-len(str(width)) - 1]}.'
+    return None
+
+
+def encode(image, image_format):
+    buffer = BytesIO()
+    if image_format in ('JPEG', 'BMP') and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.save(buffer, image_format, quality=IMAGE_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def strip_metadata(file):
+    file.seek(0)
+    with Image.open(file) as image:
+        if getattr(image, 'is_animated', False):
+            file.seek(0)
+            return file
+        image_format = image.format
+        image = ImageOps.exif_transpose(image)
+        return ContentFile(encode(image, image_format), name=file.name)
+
+
+def create_derivatives(field_file):
+    if not field_file:
+        return
+    storage = field_file.storage
+    # Имя копии производно от имени оригинала и не должно хешироваться.
+    save = getattr(storage, 'save_exact', storage.save)
+    with field_file.open('rb'), Image.open(field_file) as original:
+        original = ImageOps.exif_transpose(original)
+        for size, width in IMAGE_SIZES.items():
+            image = original.copy()
+            image.thumbnail((width, width))
+            for image_format, (pil_format, _) in IMAGE_FORMATS.items():
+                name = derivative_name(field_file.name, size, image_format)
+                if not storage.exists(name):
+                    save(name, ContentFile(encode(image, pil_format)))
+
+
+def derivatives_field(field_file):
+    """Поле модели с именем оригинала, для которого созданы копии."""
+    return f'{field_file.field.name}_derivatives'
+
+
+def has_derivatives(field_file):
+    return bool(field_file) and getattr(
+        field_file.instance, derivatives_field(field_file), None
+    ) == field_file.name
+
+
+def needs_derivatives(field_file):
+    if not field_file or has_derivatives(field_file):
+        return False
+    return field_file.storage.exists(field_file.name)
+
+
+def mark_derivatives(field_file):
+    """Отметить копии готовыми, если оригинал за это время не заменили."""
+    instance = field_file.instance
+    return type(instance).objects.filter(
+        pk=instance.pk, **{field_file.field.name: field_file.name}
+    ).update(**{derivatives_field(field_file): field_file.name})
@@ -0,0 +1,61 @@
+import bisect
+import threading
+
+from django.db.models import Count, Max
+
+from api.cache import INGREDIENTS, get_version
+from recipes.models import Ingredient
+
+
+class IngredientPrefixIndex:
+    """Отсортированный по casefold-имени индекс ингредиентов процесса.
+
+    Перестраивается при первом запросе после изменения версии INGREDIENTS
+    или состояния таблицы (число строк и максимальный id): так индекс видит
+    и строки, добавленные в обход сигналов, например bulk_create.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+        self._entries = ((), ())
+
+    def _build(self, state):
+        entries = sorted(
+            (name.casefold(), pk)
+            for pk, name in Ingredient.objects.values_list('id', 'name')
+        )
+        self._entries = (
+            tuple(name for name, _ in entries),
+            tuple(pk for _, pk in entries)
+        )
+        self._state = state
+
+    @staticmethod
+    def get_state():
+        return (
+            get_version(INGREDIENTS),
+            *Ingredient.objects.aggregate(
+                count=Count('id'), max_id=Max('id')
+            ).values()
+        )
+
+    def search(self, prefix, limit):
+        state = self.get_state()
+        if state != self._state:
+            with self._lock:
+                if state != self._state:
+                    self._build(state)
+        names, ids = self._entries
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(names, prefix)
+        end = start
+        while (
+            end < len(names) and end - start < limit
+            and names[end].startswith(prefix)
+        ):
+            end += 1
+        return ids[start:end]
+
+
+ingredient_index = IngredientPrefixIndex()
@@ -0,0 +1,327 @@
+import base64
+import json
+import math
+import platform
+import secrets
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import baseconv, timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+
+from api.urls import router
+from jobs.models import Job
+from recipes.models import Recipe, ShoppingList
+from users.models import User
+
+API_ROOT = '/api/'
+REQUESTS = 30
+WARMUP = 2
+PERCENTILES = (50, 95, 99)
+# Маршруты, которым нужен текущий пароль или данные другого пользователя.
+SKIPPED = {
+    ('user', 'update'), ('user', 'partial_update'),
+    ('user', 'set-password'), ('user', 'me-avatar'),
+}
+# Эти действия выполняются над рецептом пользователя, иначе ответ - 403.
+OWNER_ACTIONS = ('update', 'partial_update', 'destroy')
+
+
+def encode_image():
+    buffer = BytesIO()
+    Image.new('RGB', (64, 64), 'orange').save(buffer, 'PNG')
+    return (
+        'data:image/png;base64,'
+        + base64.b64encode(buffer.getvalue()).decode()
+    )
+
+
+class Dataset:
+    def __init__(self, user):
+        self.user = user
+        recipes = Recipe.objects.order_by('-pub_date')
+        self.recipe = recipes.exclude(author=user).first() or recipes.first()
+        self.own_recipe = recipes.filter(author=user).first()
+        self.recipe_ids = list(recipes.values_list('pk', flat=True)[:10])
+        self.samples = {
+            'user': User.objects.exclude(pk=user.pk).first() or user,
+            'recipe': self.recipe,
+            'jobs': Job.objects.filter(user=user).first(),
+        }
+        self.bodies = {
+            ('user', 'create'): {
+                'email': 'benchmark_api@example.com',
+                'username': 'benchmark_api',
+                'first_name': 'Замер',
+                'last_name': 'Замеров',
+                'password': secrets.token_urlsafe(16),
+            },
+        }
+        source = self.own_recipe or self.recipe
+        if source is not None:
+            recipe = {
+                'name': f'{source.name} (замер)',
+                'ingredients': [
+                    {'id': ingredient_id, 'amount': amount}
+                    for ingredient_id, amount in
+                    source.recipe_ingredients.values_list(
+                        'ingredient_id', 'amount'
+                    )
+                ],
+            }
+            full_recipe = {
+                **recipe,
+                'text': source.text,
+                'cooking_time': source.cooking_time,
+                'tags': list(source.tags.values_list('pk', flat=True)),
+                'image': encode_image(),
+            }
+            self.bodies.update({
+                ('recipe', 'create'): full_recipe,
+                ('recipe', 'update'): full_recipe,
+                ('recipe', 'partial_update'): recipe,
+            })
+
+    def sample(self, basename, viewset, action=None):
+        if basename == 'recipe' and action in OWNER_ACTIONS:
+            return self.own_recipe
+        if basename in self.samples:
+            return self.samples[basename]
+        return viewset.queryset.first()
+
+    def body(self, basename, action):
+        if action in ('favorite-bulk', 'shopping-cart-bulk'):
+            return {'recipes': self.recipe_ids}
+        return self.bodies.get((basename, action))
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер задержки, количества запросов к БД и размера ответов '
+        'для маршрутов api/urls.py'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            default=REQUESTS,
+            type=int,
+            help='Количество замеров на маршрут'
+        )
+        parser.add_argument(
+            '--warmup',
+            default=WARMUP,
+            type=int,
+            help='Количество прогревочных запросов'
+        )
+        parser.add_argument(
+            '--email',
+            help='Пользователь для авторизованных запросов'
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark.json',
+            help='Файл для результатов'
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Результаты предыдущего запуска для сравнения'
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['email'])
+        dataset = Dataset(user)
+        token, _ = Token.objects.get_or_create(user=user)
+        clients = {
+            'anonymous': Client(raise_request_exception=False),
+            'authenticated': Client(
+                raise_request_exception=False,
+                HTTP_AUTHORIZATION=f'Token {token.key}'
+            ),
+        }
+        routes, skipped = self.get_routes(dataset)
+        results = []
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+        ):
+            for viewer, client in clients.items():
+                for name, method, url, body in routes:
+                    result = self.measure(
+                        client, method, url, body, options
+                    )
+                    result.update(route=name, method=method.upper(),
+                                  url=url, viewer=viewer)
+                    results.append(result)
+                    self.stdout.write(
+                        f'{viewer:13} {method.upper():6} {url:50} '
+                        f'{result["status"]} p50={result["p50_ms"]} мс '
+                        f'queries={result["queries"]}'
+                    )
+        report = {
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'requests': options['requests'],
+            'user': user.email,
+            'results': results,
+            'skipped': skipped,
+        }
+        with open(options['output'], 'w', encoding='utf8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        if options['baseline']:
+            self.compare(results, options['baseline'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'
+        ))
+
+    @staticmethod
+    def get_user(email):
+        if email:
+            user = User.objects.filter(email=email).first()
+            if user is None:
+                raise CommandError(f'Пользователь {email} не найден')
+            return user
+        cart = ShoppingList.objects.order_by('user_id').first()
+        user = cart.user if cart else User.objects.order_by('pk').first()
+        if user is None:
+            raise CommandError(
+                'Нет пользователей: запустите generate_fake_data'
+            )
+        return user
+
+    @staticmethod
+    def get_routes(dataset):
+        routes, skipped = [], []
+
+        def add(prefix, basename, action, path, method, detail_pk=None):
+            label = f'{method.upper()} {basename}-{action}'
+            if (basename, action) in SKIPPED:
+                skipped.append(label)
+                return
+            if detail_pk is False:
+                skipped.append(f'{label}: нет данных')
+                return
+            parts = (prefix, detail_pk, path)
+            routes.append((
+                f'{basename}-{action}',
+                method,
+                API_ROOT + ''.join(
+                    f'{part}/' for part in parts if part is not None
+                ),
+                dataset.body(basename, action)
+            ))
+
+        def get_detail_pk(basename, viewset, action=None):
+            sample = dataset.sample(basename, viewset, action)
+            return sample.pk if sample is not None else False
+
+        for prefix, viewset, basename in router.registry:
+            for action, method, detail in (
+                ('list', 'get', False),
+                ('create', 'post', False),
+                ('retrieve', 'get', True),
+                ('update', 'put', True),
+                ('partial_update', 'patch', True),
+                ('destroy', 'delete', True),
+            ):
+                if (
+                    hasattr(viewset, action)
+                    and method in viewset.http_method_names
+                ):
+                    add(
+                        prefix,
+                        basename,
+                        action,
+                        None,
+                        method,
+                        get_detail_pk(basename, viewset, action)
+                        if detail else None
+                    )
+            for extra in viewset.get_extra_actions():
+                for method in extra.mapping:
+                    add(
+                        prefix,
+                        basename,
+                        extra.url_name,
+                        extra.url_path,
+                        method,
+                        get_detail_pk(basename, viewset)
+                        if extra.detail else None
+                    )
+        if dataset.recipe is not None:
+            routes.append((
+                'recipe-short-link',
+                'get',
+                reverse('recipe-short-link', kwargs={
+                    'short_string': baseconv.base62.encode(dataset.recipe.pk)
+                }),
+                None
+            ))
+        skipped.append('auth/*: маршруты djoser')
+        return routes, skipped
+
+    @staticmethod
+    def request(client, method, url, body):
+        if method == 'get':
+            return client.get(url)
+        with transaction.atomic():
+            response = getattr(client, method)(
+                url, data=body, content_type='application/json'
+            )
+            transaction.set_rollback(True)
+        return response
+
+    def measure(self, client, method, url, body, options):
+        for _ in range(options['warmup']):
+            response_size(self.request(client, method, url, body))
+        timings = []
+        for _ in range(options['requests']):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = self.request(client, method, url, body)
+                size = response_size(response)
+                timings.append((time.perf_counter() - started) * 1000)
+        result = {
+            f'p{percent}_ms': round(percentile(timings, percent), 2)
+            for percent in PERCENTILES
+        }
+        result.update(
+            status=response.status_code,
+            queries=len(queries.captured_queries),
+            bytes=size
+        )
+        return result
+
+    def compare(self, results, baseline):
+        with open(baseline, encoding='utf8') as file:
+            previous = {
+                (item['viewer'], item['method'], item['route']): item
+                for item in json.load(file)['results']
+            }
+        for item in results:
+            old = previous.get((item['viewer'], item['method'], item['route']))
+            if old is None:
+                continue
+            self.stdout.write(
+                f'{item["viewer"]:13} {item["method"]:6} {item["route"]:40} '
+                f'p50 {old["p50_ms"]} -> {item["p50_ms"]} мс, '
+                f'queries {old["queries"]} -> {item["queries"]}'
+            )
@@ -0,0 +1,111 @@
+import re
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.exports import EXPORTERS, get_shopping_cart_ingredients
+from recipes.models import (
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingList
+)
+from users.models import User
+
+LINES = 5000
+REPEAT = 3
+BATCH_SIZE = 1000
+PDF_PAGE = re.compile(rb'/Type /Page\b(?!s)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер времени и пиковой памяти выгрузки списка покупок '
+        'на синтетической корзине; данные создаются и откатываются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lines',
+            default=LINES,
+            type=int,
+            help='Количество строк в списке покупок'
+        )
+        parser.add_argument(
+            '--repeat',
+            default=REPEAT,
+            type=int,
+            help='Количество замеров на формат'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.create_cart(options['lines'])
+            ingredients = get_shopping_cart_ingredients(user)
+            for export_format in ('pdf', *EXPORTERS):
+                self.measure(export_format, ingredients, options['repeat'])
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_cart(lines):
+        user = User.objects.create(
+            username='benchmark_shopping_cart',
+            email='benchmark_shopping_cart@example.com'
+        )
+        Ingredient.objects.bulk_create(
+            [
+                Ingredient(
+                    name=f'Ингредиент для замера {number:05}',
+                    measurement_unit='г'
+                )
+                for number in range(lines)
+            ],
+            batch_size=BATCH_SIZE
+        )
+        recipe = Recipe.objects.create(
+            author=user,
+            name='Рецепт для замера',
+            text='Описание',
+            image='recipes_images/benchmark.png',
+            cooking_time=1
+        )
+        RecipeIngredient.objects.bulk_create(
+            (
+                RecipeIngredient(recipe=recipe, ingredient_id=pk, amount=1)
+                for pk in Ingredient.objects.filter(
+                    name__startswith='Ингредиент для замера'
+                ).values_list('pk', flat=True)
+            ),
+            batch_size=BATCH_SIZE
+        )
+        ShoppingList.objects.create(user=user, recipe=recipe)
+        return user
+
+    @staticmethod
+    def export(export_format, ingredients):
+        if export_format == 'pdf':
+            from api.pdf import render_shopping_list
+
+            return render_shopping_list(ingredients).read()
+        return ''.join(EXPORTERS[export_format](ingredients)).encode()
+
+    def measure(self, export_format, ingredients, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = self.export(export_format, ingredients)
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        self.export(export_format, ingredients)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        pages = ''
+        if export_format == 'pdf':
+            pages = f', страниц: {len(PDF_PAGE.findall(content))}'
+        self.stdout.write(
+            f'{export_format:4} {min(timings):.3f} с, '
+            f'пик памяти {peak / 1024 / 1024:.1f} МБ, '
+            f'{len(content) / 1024:.0f} КБ{pages}'
+        )
@@ -0,0 +1,102 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import QueryDict
+
+from api.filters import RecipeFilter
+from recipes.models import Recipe, RecipeTag, Tag
+from users.models import User
+
+RECIPES = 100_000
+TAGS = 10
+FILTER_TAGS = 3
+REPEAT = 5
+PAGE_SIZE = 6
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер фильтрации рецептов по тегам: Exists() из RecipeFilter '
+        'против JOIN с DISTINCT; данные создаются и откатываются'
+    )
+
+    def add_arguments(self, parser):
+        for name, default, help_text in (
+            ('recipes', RECIPES, 'Количество рецептов'),
+            ('tags', TAGS, 'Количество тегов'),
+            ('filter-tags', FILTER_TAGS, 'Тегов в фильтре'),
+            ('repeat', REPEAT, 'Количество замеров'),
+        ):
+            parser.add_argument(
+                f'--{name}', default=default, type=int, help=help_text
+            )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            slugs = self.create_recipes(options['recipes'], options['tags'])
+            self.stdout.write(
+                f'Создано рецептов: {options["recipes"]} за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+            slugs = slugs[:options['filter_tags']]
+            data = QueryDict(mutable=True)
+            data.setlist('tags', slugs)
+            for name, queryset in (
+                ('exists', RecipeFilter(
+                    data, queryset=Recipe.objects.all()
+                ).qs),
+                ('join', Recipe.objects.filter(
+                    tags__slug__in=slugs
+                ).distinct()),
+            ):
+                self.measure(name, queryset, options['repeat'])
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def create_recipes(total, tags):
+        author = User.objects.create(
+            username='benchmark_tag_filter',
+            email='benchmark_tag_filter@example.com'
+        )
+        slugs = [f'benchmark-{number}' for number in range(tags)]
+        Tag.objects.bulk_create(
+            Tag(name=f'Тег для замера {number}', slug=slug)
+            for number, slug in enumerate(slugs)
+        )
+        tag_ids = list(Tag.objects.filter(slug__in=slugs).order_by(
+            'slug'
+        ).values_list('pk', flat=True))
+        for offset in range(0, total, BATCH_SIZE):
+            recipes = Recipe.objects.bulk_create(
+                Recipe(
+                    author=author,
+                    name=f'Рецепт {number}',
+                    text='Описание',
+                    image='recipes_images/benchmark.png',
+                    cooking_time=1
+                )
+                for number in range(offset, min(offset + BATCH_SIZE, total))
+            )
+            RecipeTag.objects.bulk_create(
+                RecipeTag(recipe=recipe, tags_id=tag_id)
+                for index, recipe in enumerate(recipes)
+                for tag_id in (
+                    tag_ids[index % tags], tag_ids[(index + 1) % tags]
+                )
+            )
+        return slugs
+
+    def measure(self, name, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            total = queryset.count()
+            list(queryset.order_by('-pub_date', '-id')[:PAGE_SIZE])
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(
+            f'{name:6} найдено {total}, COUNT + первая страница: '
+            f'{min(timings) * 1000:.1f} мс (лучший из {repeat})'
+        )
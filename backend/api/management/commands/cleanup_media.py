@@ -0,0 +1,120 @@
+import os
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from api.images import derivative_names, derivative_source_prefix
+
+MIN_AGE_HOURS = 24
+
+
+def file_fields():
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if (
+                isinstance(field, models.FileField)
+                and field.storage is default_storage
+                and isinstance(field.upload_to, str)
+            ):
+                yield model, field
+
+
+def referenced_names():
+    names = set()
+    for model, field in file_fields():
+        with_derivatives = hasattr(model, f'{field.name}_derivatives')
+        for name in model._default_manager.exclude(
+            **{field.name: ''}
+        ).exclude(**{f'{field.name}__isnull': True}).values_list(
+            field.name, flat=True
+        ).iterator():
+            names.add(name)
+            if with_derivatives:
+                names.update(derivative_names(name))
+    return names
+
+
+def is_referenced(name):
+    """Проверить ссылку на файл по БД прямо перед удалением."""
+    source = derivative_source_prefix(name)
+    for model, field in file_fields():
+        lookups = [Q(**{field.name: name})]
+        if source and hasattr(model, f'{field.name}_derivatives'):
+            lookups.append(Q(**{f'{field.name}__startswith': source}))
+        if model._default_manager.filter(reduce(or_, lookups)).exists():
+            return True
+    return False
+
+
+def walk(storage, directory):
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield os.path.join(directory, name)
+    for name in directories:
+        yield from walk(storage, os.path.join(directory, name))
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаление файлов медиа, на которые не ссылается ни одна запись, '
+        'вместе с их уменьшенными копиями'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            default=MIN_AGE_HOURS,
+            type=float,
+            help=(
+                'Не трогать файлы моложе указанного числа часов: их запись '
+                'может быть еще не сохранена'
+            )
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы, которые будут удалены'
+        )
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        delete = getattr(storage, 'delete_exact', storage.delete)
+        threshold = timezone.now() - timedelta(hours=options['min_age'])
+        referenced = referenced_names()
+        directories = {
+            field.upload_to.strip('/') for _, field in file_fields()
+        }
+        removed = size = 0
+        for directory in sorted(directories):
+            for name in walk(storage, directory):
+                if (
+                    name in referenced
+                    or storage.get_modified_time(name) > threshold
+                ):
+                    continue
+                # Пока шел обход, файл могли загрузить заново: это
+                # добавляет ссылку и обновляет время изменения.
+                if not options['dry_run'] and (
+                    is_referenced(name)
+                    or storage.get_modified_time(name) > threshold
+                ):
+                    continue
+                size += storage.size(name)
+                removed += 1
+                if options['dry_run']:
+                    self.stdout.write(name)
+                else:
+                    delete(name)
+        message = f'Файлов без ссылок: {removed}, {size / 1024:.0f} КБ'
+        if options['dry_run']:
+            message = f'[dry-run] {message}'
+        self.stdout.write(self.style.SUCCESS(message))
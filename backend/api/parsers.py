@@ -0,0 +1,27 @@
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+
+class MultiPartJSONParser(MultiPartParser):
+    """Multipart-форма, в которой вложенные поля переданы строками JSON."""
+
+    json_fields = ('ingredients', 'tags')
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        result = super().parse(stream, media_type, parser_context)
+        data = {}
+        for key, values in result.data.lists():
+            if key not in self.json_fields:
+                data[key] = values[-1]
+            elif len(values) == 1 and values[0].lstrip().startswith('['):
+                try:
+                    data[key] = json.loads(values[0])
+                except ValueError as error:
+                    raise ParseError(
+                        f'Некорректный JSON в поле {key}: {error}'
+                    )
+            else:
+                data[key] = values
+        return DataAndFiles(data, dict(result.files.items()))
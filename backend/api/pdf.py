@@ -0,0 +1,86 @@
+import threading
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from api.constants import (
+    PDFFONTIZE,
+    PDFFOOTERY,
+    PDFHEADBEGINY,
+    PDFLINEHEIGHT,
+    PDFSPOOLSIZE,
+    PDFTEXTBEGINX,
+    PDFTEXTBEGINY,
+    PDFTEXTENDY
+)
+from api.exports import format_line
+
+FONTS = {
+    'DejaVuSans': 'DejaVuSans.ttf',
+    'DejaVuSans-Bold': 'DejaVuSans-Bold.ttf',
+}
+TITLE = 'Список ингредиентов для сохраненных рецептов'
+
+_fonts_lock = threading.Lock()
+_fonts_registered = False
+
+
+def register_fonts():
+    global _fonts_registered
+    if _fonts_registered:
+        return
+    with _fonts_lock:
+        if _fonts_registered:
+            return
+        for name, filename in FONTS.items():
+            pdfmetrics.registerFont(
+                TTFont(name, settings.BASE_DIR / 'fonts' / filename)
+            )
+        _fonts_registered = True
+
+
+class ShoppingListCanvas:
+    """Постранично выводит строки списка покупок с заголовком и номером."""
+
+    def __init__(self, file):
+        register_fonts()
+        self.canvas = canvas.Canvas(file, pagesize=A4, pageCompression=1)
+        self.page = 0
+        self.start_page()
+
+    def start_page(self):
+        self.page += 1
+        self.canvas.setFont('DejaVuSans-Bold', PDFFONTIZE)
+        self.canvas.drawString(PDFTEXTBEGINX, PDFHEADBEGINY, TITLE)
+        self.canvas.setFont('DejaVuSans', PDFFONTIZE)
+        self.canvas.drawRightString(
+            A4[0] - PDFTEXTBEGINX,
+            PDFFOOTERY,
+            str(self.page)
+        )
+        self.y = PDFTEXTBEGINY
+
+    def write_line(self, line):
+        if self.y < PDFTEXTENDY:
+            self.canvas.showPage()
+            self.start_page()
+        self.canvas.drawString(PDFTEXTBEGINX, self.y, line)
+        self.y -= PDFLINEHEIGHT
+
+    def save(self):
+        self.canvas.showPage()
+        self.canvas.save()
+
+
+def render_shopping_list(ingredients):
+    file = SpooledTemporaryFile(max_size=PDFSPOOLSIZE)
+    document = ShoppingListCanvas(file)
+    for item in ingredients.iterator():
+        document.write_line(format_line(item))
+    document.save()
+    file.seek(0)
+    return file
@@ -1,7 +1,12 @@
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 
+from api.constants import MAX_PAGE_SIZE
 from api.fields import Base64ImageField
+from api.viewer import ViewerStateListSerializer, get_viewer_state
+from jobs.models import Job
 from recipes.models import (
     Favorite,
     Ingredient,
@@ -35,12 +40,17 @@ class UserReadSerializer(serializers.ModelSerializer):
             'is_subscribed',
             'avatar',
         )
+        list_serializer_class = ViewerStateListSerializer
+
+    @staticmethod
+    def prime_viewer_state(viewer, users):
+        viewer.prime(author_ids=[user.pk for user in users])
 
     def get_is_subscribed(self, obj):
-        user = self.context.get('request').user
-        if user.is_anonymous:
-            return False
-        return Subscription.objects.filter(user=user, author=obj).exists()
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        viewer = get_viewer_state(self.context)
+        return viewer is not None and viewer.is_subscribed(obj.pk)
 
 
 class UserWriteSerializer(serializers.ModelSerializer):
@@ -84,10 +94,30 @@ class ShortRecipeListSerializer(serializers.ModelSerializer):
         )
 
 
+class RecipeIdsSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_PAGE_SIZE
+    )
+
+    @staticmethod
+    def validate_recipes(value):
+        recipe_ids = set(value)
+        missing = recipe_ids - set(Recipe.objects.filter(
+            pk__in=recipe_ids
+        ).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(
+                f'Рецепты не найдены: {sorted(missing)}'
+            )
+        return sorted(recipe_ids)
+
+
 class SubscriptionSerializer(serializers.ModelSerializer):
     is_subscribed = serializers.SerializerMethodField()
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.SerializerMethodField()
+    recipes_count = serializers.ReadOnlyField()
 
     class Meta:
         model = User
@@ -102,25 +132,39 @@ class SubscriptionSerializer(serializers.ModelSerializer):
             'recipes_count',
             'avatar'
         )
+        list_serializer_class = ViewerStateListSerializer
 
-    def get_recipes(self, obj):
-        request = self.context.get('request')
+    @staticmethod
+    def get_recipes_queryset(request, recipes):
         recipes_limit = request.query_params.get('recipes_limit')
-        recipes = Recipe.objects.filter(author=obj)
-        if recipes_limit:
+        if recipes_limit and recipes_limit.isdigit():
             recipes = recipes[:int(recipes_limit)]
+        return recipes
+
+    def get_recipes(self, obj):
+        if hasattr(obj, 'short_recipes'):
+            recipes = obj.short_recipes
+        else:
+            recipes = self.get_recipes_queryset(
+                self.context.get('request'),
+                Recipe.objects.filter(author=obj)
+            )
         return ShortRecipeListSerializer(
             recipes,
             many=True,
-            read_only=True
+            read_only=True,
+            context=self.context
         ).data
 
-    def get_recipes_count(self, obj):
-        return Recipe.objects.filter(author=obj).count()
+    @staticmethod
+    def prime_viewer_state(viewer, users):
+        viewer.prime(author_ids=[user.pk for user in users])
 
     def get_is_subscribed(self, obj):
-        user = self.context['request'].user
-        return Subscription.objects.filter(user=user, author=obj).exists()
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        viewer = get_viewer_state(self.context)
+        return viewer is not None and viewer.is_subscribed(obj.pk)
 
 
 class SubscribeSerializer(serializers.ModelSerializer):
@@ -207,20 +251,26 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'text',
             'cooking_time'
         )
+        list_serializer_class = ViewerStateListSerializer
+
+    @staticmethod
+    def prime_viewer_state(viewer, recipes):
+        viewer.prime(
+            recipe_ids=[recipe.pk for recipe in recipes],
+            author_ids=[recipe.author_id for recipe in recipes]
+        )
 
     def get_is_favorited(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return Favorite.objects.filter(
-                user=request.user, recipe=obj).exists()
-        return False
+        if hasattr(obj, 'is_favorited'):
+            return obj.is_favorited
+        viewer = get_viewer_state(self.context)
+        return viewer is not None and viewer.is_favorited(obj.pk)
 
     def get_is_in_shopping_cart(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return ShoppingList.objects.filter(
-                user=request.user, recipe=obj).exists()
-        return False
+        if hasattr(obj, 'is_in_shopping_cart'):
+            return obj.is_in_shopping_cart
+        viewer = get_viewer_state(self.context)
+        return viewer is not None and viewer.is_in_shopping_cart(obj.pk)
 
 
 class IngredientWriteSerializer(serializers.ModelSerializer):
@@ -259,6 +309,37 @@ class RecipeWriteSerializer(RecipeReadSerializer):
         ]
         RecipeIngredient.objects.bulk_create(recipe_ingredients)
 
+    def update_ingredients(self, recipe, ingredients):
+        existing = {
+            item.ingredient_id: item
+            for item in recipe.recipe_ingredients.all()
+        }
+        amounts = {
+            ingredient['id'].id: ingredient['amount']
+            for ingredient in ingredients
+        }
+        changed = []
+        for ingredient_id, item in existing.items():
+            amount = amounts.get(ingredient_id)
+            if amount is not None and amount != item.amount:
+                item.amount = amount
+                changed.append(item)
+        RecipeIngredient.objects.bulk_update(changed, ('amount',))
+        RecipeIngredient.objects.bulk_create([
+            RecipeIngredient(
+                recipe=recipe,
+                ingredient_id=ingredient_id,
+                amount=amount)
+            for ingredient_id, amount in amounts.items()
+            if ingredient_id not in existing
+        ])
+        removed = existing.keys() - amounts.keys()
+        if removed:
+            recipe.recipe_ingredients.filter(
+                ingredient_id__in=removed
+            ).delete()
+
+    @transaction.atomic
     def create(self, validated_data):
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
@@ -267,19 +348,15 @@ class RecipeWriteSerializer(RecipeReadSerializer):
         recipe.tags.set(tags)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients', None)
         tags = validated_data.pop('tags', None)
         instance = super().update(instance, validated_data)
         if ingredients is not None:
-            RecipeIngredient.objects.filter(recipe=instance).delete()
-            self.create_update_ingredients(
-                recipe=instance,
-                ingredients=ingredients
-            )
+            self.update_ingredients(instance, ingredients)
         if tags is not None:
             instance.tags.set(tags)
-        instance.save()
         return instance
 
     @staticmethod
@@ -309,10 +386,25 @@ class RecipeWriteSerializer(RecipeReadSerializer):
         return value
 
 
+class JobSerializer(serializers.ModelSerializer):
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = ('id', 'status', 'error', 'created', 'finished', 'download')
+
+    def get_download(self, obj):
+        if obj.status != Job.DONE or not obj.result:
+            return None
+        return self.context['request'].build_absolute_uri(
+            reverse('jobs-download', kwargs={'pk': obj.pk})
+        )
+
+
 class BaseFavoriteShoppingListSerializer(serializers.ModelSerializer):
     id = serializers.IntegerField(source='recipe.id', read_only=True)
     name = serializers.CharField(source='recipe.name', read_only=True)
-    image = serializers.ImageField(source='recipe.image', read_only=True)
+    image = Base64ImageField(source='recipe.image', read_only=True)
     cooking_time = serializers.IntegerField(
         source='recipe.cooking_time',
         read_only=True
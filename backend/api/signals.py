@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework.authtoken.models import Token
+
+from api.authentication import forget_tokens
+from api.cache import (
+    INGREDIENTS,
+    RECIPES,
+    TAGS,
+    bump_version,
+    shopping_cart,
+    user_state
+)
+from api.images import needs_derivatives
+from jobs.queue import enqueue_once
+from recipes.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    ShoppingList,
+    Tag
+)
+from users.models import Subscription, User
+
+
+def bump_recipes_version(**kwargs):
+    transaction.on_commit(lambda: bump_version(RECIPES))
+
+
+def bump_tags_version(**kwargs):
+    transaction.on_commit(lambda: bump_version(TAGS))
+
+
+def bump_ingredients_version(**kwargs):
+    transaction.on_commit(lambda: bump_version(INGREDIENTS))
+
+
+def bump_user_state_version(instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(user_state(instance.user_id)))
+
+
+def bump_shopping_cart_version(instance, **kwargs):
+    transaction.on_commit(
+        lambda: bump_version(shopping_cart(instance.user_id))
+    )
+
+
+def generate_image_derivatives(instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    field = 'image' if isinstance(instance, Recipe) else 'avatar'
+    if needs_derivatives(getattr(instance, field)):
+        transaction.on_commit(lambda: enqueue_once(
+            'api.tasks.create_image_derivatives',
+            model=instance._meta.label,
+            pk=instance.pk,
+            field=field
+        ))
+
+
+def forget_user_tokens(instance, **kwargs):
+    keys = list(Token.objects.filter(user=instance).values_list(
+        'key', flat=True
+    ))
+    if keys:
+        transaction.on_commit(lambda: forget_tokens(keys))
+
+
+def forget_deleted_token(instance, **kwargs):
+    transaction.on_commit(lambda: forget_tokens([instance.key]))
+
+
+def bump_recipes_version_on_author_change(update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_recipes_version()
+
+
+for model in (Recipe, RecipeIngredient, RecipeTag, Tag, Ingredient):
+    post_save.connect(bump_recipes_version, sender=model)
+    post_delete.connect(bump_recipes_version, sender=model)
+m2m_changed.connect(bump_recipes_version, sender=Recipe.tags.through)
+m2m_changed.connect(bump_recipes_version, sender=Recipe.ingredients.through)
+post_save.connect(bump_recipes_version_on_author_change, sender=User)
+post_delete.connect(bump_recipes_version, sender=User)
+for signal in (post_save, post_delete):
+    signal.connect(bump_tags_version, sender=Tag)
+    signal.connect(bump_ingredients_version, sender=Ingredient)
+    for model in (Favorite, ShoppingList, Subscription):
+        signal.connect(bump_user_state_version, sender=model)
+    signal.connect(bump_shopping_cart_version, sender=ShoppingList)
+post_save.connect(generate_image_derivatives, sender=Recipe)
+post_save.connect(generate_image_derivatives, sender=User)
+post_save.connect(forget_user_tokens, sender=User)
+post_delete.connect(forget_deleted_token, sender=Token)
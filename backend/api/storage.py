@@ -0,0 +1,62 @@
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+HASHED_NAME = re.compile(r'^[0-9a-f]{64}')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, именующее файлы по sha256 содержимого.
+
+    Файл сохраняется как <каталог>/ab/cd/<sha256><расширение>, поэтому
+    одинаковые загрузки записываются один раз, а имя никогда не меняет
+    содержимого. Имена, которые уже начинаются с хеша, и файлы,
+    сохраненные через save_exact (уменьшенные копии изображений),
+    сохраняются как есть. Файлы без ссылок удаляет команда cleanup_media.
+    """
+
+    def hashed_name(self, name, content):
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        content.seek(0)
+        digest = sha256.hexdigest()
+        directory, basename = os.path.split(name)
+        return os.path.join(
+            directory,
+            digest[:2],
+            digest[2:4],
+            digest + os.path.splitext(basename)[1].lower()
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        if not HASHED_NAME.match(os.path.basename(name)):
+            name = self.hashed_name(name, content)
+            try:
+                # Свежее время изменения не дает cleanup_media удалить
+                # файл, на который сейчас появится новая ссылка.
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                pass
+        return super().save(name, content, max_length)
+
+    def save_exact(self, name, content):
+        """Сохранить файл под переданным именем, без хеширования."""
+        return super().save(name, content)
+
+    def delete(self, name):
+        """Общий для нескольких объектов файл не удаляется."""
+        if not HASHED_NAME.match(os.path.basename(name)):
+            super().delete(name)
+
+    def delete_exact(self, name):
+        """Удалить файл, даже если его имя - хеш содержимого."""
+        super().delete(name)
@@ -0,0 +1,28 @@
+from django.apps import apps
+from django.core.files import File
+
+from api.cache import RECIPES, bump_version
+from api.exports import get_shopping_cart_ingredients
+from api.images import (
+    create_derivatives,
+    mark_derivatives,
+    needs_derivatives
+)
+
+
+def render_shopping_cart_pdf(job):
+    from api.pdf import render_shopping_list
+
+    file = render_shopping_list(get_shopping_cart_ingredients(job.user))
+    job.result.save(f'shopping_list_{job.pk}.pdf', File(file), save=False)
+
+
+def create_image_derivatives(job):
+    instance = apps.get_model(job.kwargs['model']).objects.get(
+        pk=job.kwargs['pk']
+    )
+    field_file = getattr(instance, job.kwargs['field'])
+    if needs_derivatives(field_file):
+        create_derivatives(field_file)
+        if mark_derivatives(field_file):
+            bump_version(RECIPES)
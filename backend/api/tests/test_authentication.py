@@ -0,0 +1,37 @@
+import pickle
+
+from django.core.cache import cache
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api.authentication import token_cache_key
+from users.models import User
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='user@example.com', username='user', password='password'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_token_has_no_password_hash(self):
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+        cached = cache.get(token_cache_key(self.token.key))
+        self.assertEqual(cached.user.pk, self.user.pk)
+        self.assertNotIn(
+            self.user.password.encode(), pickle.dumps(cached)
+        )
+
+    def test_set_password_with_cached_token(self):
+        self.client.get('/api/users/me/')
+        response = self.client.post(
+            '/api/users/set_password/',
+            {'current_password': 'password', 'new_password': 'N3w-pass!x'}
+        )
+        self.assertEqual(response.status_code, 204)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('N3w-pass!x'))
@@ -0,0 +1,53 @@
+from rest_framework.test import APITestCase
+
+from recipes.models import Favorite, Recipe, ShoppingList
+from users.models import User
+
+
+class BulkFavoriteShoppingCartTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='user@example.com', username='user', password='password'
+        )
+        cls.recipe_ids = [
+            Recipe.objects.create(
+                author=cls.user,
+                name=f'Рецепт {number}',
+                image='recipes_images/recipe.png',
+                text='Описание',
+                cooking_time=10
+            ).pk
+            for number in range(4)
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def counters(self, field):
+        return list(Recipe.objects.order_by('pk').values_list(
+            field, flat=True
+        ))
+
+    def test_add_and_remove_change_counters_once(self):
+        for url, model, field in (
+            ('/api/recipes/favorite/', Favorite, 'favorites_count'),
+            ('/api/recipes/shopping_cart/', ShoppingList, 'in_carts_count'),
+        ):
+            with self.subTest(url=url):
+                model.objects.create(
+                    user=self.user, recipe_id=self.recipe_ids[0]
+                )
+                response = self.client.post(
+                    url, {'recipes': self.recipe_ids[:3]}, format='json'
+                )
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(len(response.data), 3)
+                self.assertEqual(self.counters(field), [1, 1, 1, 0])
+                response = self.client.delete(
+                    url, {'recipes': self.recipe_ids[1:]}, format='json'
+                )
+                self.assertEqual(response.status_code, 204)
+                self.assertEqual(self.counters(field), [1, 0, 0, 0])
+                self.assertEqual(model.objects.count(), 1)
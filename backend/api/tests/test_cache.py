@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from api.cache import RECIPES, bump_version, get_version
+from recipes.models import Recipe
+from users.models import User
+
+
+def run_in_other_process(code):
+    """Выполняет код в отдельном процессе с теми же настройками кеша."""
+    cache_settings = settings.CACHES['default']
+    subprocess.run(
+        [sys.executable, 'manage.py', 'shell', '-c', code],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            'CACHE_BACKEND': cache_settings['BACKEND'],
+            'CACHE_LOCATION': str(cache_settings['LOCATION']),
+        },
+        check=True
+    )
+
+
+class CacheVersionTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_version_bumped_in_other_process_is_visible(self):
+        version = get_version(RECIPES)
+        run_in_other_process(
+            'from api.cache import RECIPES, bump_version; '
+            'bump_version(RECIPES)'
+        )
+        self.assertNotEqual(get_version(RECIPES), version)
+
+    def test_bump_changes_version(self):
+        version = get_version(RECIPES)
+        bump_version(RECIPES)
+        self.assertNotEqual(get_version(RECIPES), version)
+
+
+class DerivativesVersionTest(APITestCase):
+    """Воркер отмечает уменьшенные копии и меняет версию в своем процессе."""
+
+    def setUp(self):
+        cache.clear()
+        self.recipe = Recipe.objects.create(
+            author=User.objects.create_user(
+                email='author@example.com',
+                username='author',
+                password='password'
+            ),
+            name='Рецепт',
+            image='recipes_images/recipe.png',
+            text='Описание',
+            cooking_time=10
+        )
+        self.url = f'/api/recipes/{self.recipe.pk}/'
+
+    def test_bump_in_worker_process_changes_etag_and_response(self):
+        response = self.client.get(self.url, {'image_size': 'small'})
+        etag = response['ETag']
+        self.assertTrue(response.data['image'].endswith('/recipe.png'))
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            image_derivatives=self.recipe.image.name
+        )
+        run_in_other_process(
+            'from api.cache import RECIPES, bump_version; '
+            'bump_version(RECIPES)'
+        )
+        response = self.client.get(
+            self.url, {'image_size': 'small'}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertTrue(response.data['image'].endswith('_320.webp'))
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.images import derivative_name
+from recipes.models import Recipe
+from users.models import User
+
+DAY = 24 * 60 * 60
+
+
+class CleanupMediaTest(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.author = User.objects.create_user(
+            email='author@example.com', username='author', password='pass'
+        )
+
+    def save(self, content, name='recipes_images/image.png'):
+        return default_storage.save(name, ContentFile(content))
+
+    def make_old(self, name):
+        old = time.time() - 2 * DAY
+        os.utime(default_storage.path(name), (old, old))
+
+    def cleanup(self):
+        call_command('cleanup_media', stdout=StringIO())
+
+    def test_duplicate_upload_refreshes_modified_time(self):
+        name = self.save(b'image')
+        self.make_old(name)
+        self.assertEqual(self.save(b'image'), name)
+        self.assertLess(
+            time.time() - os.path.getmtime(default_storage.path(name)), 60
+        )
+
+    def test_removes_only_old_files_without_references(self):
+        referenced = self.save(b'referenced')
+        orphan = self.save(b'orphan')
+        fresh = self.save(b'fresh')
+        derivative = default_storage.save_exact(
+            derivative_name(referenced, 'small', 'webp'),
+            ContentFile(b'small')
+        )
+        for name in (referenced, orphan, derivative):
+            self.make_old(name)
+        Recipe.objects.create(
+            author=self.author,
+            name='Рецепт',
+            image=referenced,
+            text='Описание',
+            cooking_time=1
+        )
+        self.cleanup()
+        self.assertFalse(default_storage.exists(orphan))
+        for name in (referenced, fresh, derivative):
+            self.assertTrue(default_storage.exists(name))
+
+    def test_rechecks_references_before_deleting(self):
+        name = self.save(b'image')
+        derivative = default_storage.save_exact(
+            derivative_name(name, 'small', 'webp'), ContentFile(b'small')
+        )
+        for path in (name, derivative):
+            self.make_old(path)
+        Recipe.objects.create(
+            author=self.author,
+            name='Рецепт',
+            image=name,
+            text='Описание',
+            cooking_time=1
+        )
+        with mock.patch(
+            'api.management.commands.cleanup_media.referenced_names',
+            return_value=set()
+        ):
+            self.cleanup()
+        self.assertTrue(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(derivative))
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from recipes.models import Ingredient
+
+URL = '/api/ingredients/'
+
+
+class IngredientSearchTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        Ingredient.objects.create(name='Абрикос', measurement_unit='г')
+
+    def search(self, name):
+        response = self.client.get(URL, {'name': name})
+        self.assertEqual(response.status_code, 200)
+        return [ingredient['name'] for ingredient in response.data]
+
+    def test_prefix_search(self):
+        self.assertEqual(self.search('абр'), ['Абрикос'])
+        self.assertEqual(self.search('Яблоко'), [])
+
+    def test_rows_inserted_behind_index_are_found(self):
+        self.assertEqual(self.search('Абр'), ['Абрикос'])
+        Ingredient.objects.bulk_create([
+            Ingredient(name='Абрикос новый', measurement_unit='г')
+        ])
+        self.assertEqual(
+            sorted(self.search('Абр')), ['Абрикос', 'Абрикос новый']
+        )
+
+    def test_replaced_rows_are_found(self):
+        self.assertEqual(self.search('Абр'), ['Абрикос'])
+        Ingredient.objects.all()._raw_delete(Ingredient.objects.db)
+        Ingredient.objects.bulk_create([
+            Ingredient(name='Авокадо', measurement_unit='шт')
+        ])
+        self.assertEqual(self.search('Абр'), [])
+        self.assertEqual(self.search('Ав'), ['Авокадо'])
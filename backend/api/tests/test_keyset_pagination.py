@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from recipes.models import Recipe
+from users.models import User
+
+URL = '/api/recipes/'
+RECIPES_COUNT = 25
+PAGE_SIZE = 10
+
+
+class KeysetPaginationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(
+            email='author@example.com', username='author', password='pass'
+        )
+        Recipe.objects.bulk_create(
+            Recipe(
+                author=author,
+                name=f'Рецепт {number}',
+                image='recipes_images/recipe.png',
+                text='Описание',
+                cooking_time=10
+            )
+            for number in range(RECIPES_COUNT)
+        )
+        # Одинаковая дата: порядок задает только id из курсора.
+        Recipe.objects.update(pub_date=timezone.now())
+        cls.ids = list(
+            Recipe.objects.order_by('-id').values_list('pk', flat=True)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(any(
+                'OFFSET' in query['sql'] for query in context
+            ))
+            pages.append([recipe['id'] for recipe in response.data['results']])
+            url = response.data[link]
+        return pages
+
+    def test_pages_follow_id_when_pub_date_is_equal(self):
+        pages = self.walk(f'{URL}?cursor=&limit={PAGE_SIZE}', 'next')
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), self.ids)
+
+    def test_previous_links_return_same_pages(self):
+        forward = self.walk(f'{URL}?cursor=&limit={PAGE_SIZE}', 'next')
+        response = self.client.get(f'{URL}?cursor=&limit={PAGE_SIZE}')
+        last = response
+        while last.data['next']:
+            last = self.client.get(last.data['next'])
+        backward = self.walk(last.data['previous'], 'previous')
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'{URL}?cursor=broken')
+        self.assertEqual(response.status_code, 404)
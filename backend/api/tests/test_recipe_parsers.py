@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from recipes.models import Recipe
+from users.models import User
+
+
+class RecipeParsersTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email='author@example.com', username='author', password='pass'
+        )
+        self.recipe = Recipe.objects.create(
+            author=self.author,
+            name='Рецепт',
+            image='recipes_images/recipe.png',
+            text='Описание',
+            cooking_time=10
+        )
+        self.client.force_authenticate(self.author)
+        self.url = f'/api/recipes/{self.recipe.pk}/'
+
+    def patch(self, format):
+        return self.client.patch(
+            self.url, {'name': f'Рецепт ({format})'}, format=format
+        )
+
+    def test_partial_update_accepts_all_parsers(self):
+        for format in ('json', 'multipart'):
+            with self.subTest(format=format):
+                self.assertEqual(self.patch(format).status_code, 200)
+        response = self.client.generic(
+            'PATCH',
+            self.url,
+            'name=Рецепт+(form)',
+            content_type='application/x-www-form-urlencoded'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.name, 'Рецепт (form)')
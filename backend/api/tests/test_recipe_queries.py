@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from recipes.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    ShoppingList,
+    Tag
+)
+from users.models import Subscription, User
+
+RECIPES_COUNT = 60
+# COUNT, рецепты, теги, ингредиенты рецептов и сами ингредиенты;
+# для пользователя добавляется запрос авторов с is_subscribed.
+LIST_QUERIES = {'anonymous': 5, 'authenticated': 6}
+DETAIL_QUERIES = {'anonymous': 4, 'authenticated': 5}
+
+
+class RecipeQueryCountTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        authors = [
+            User.objects.create_user(
+                email=f'author{number}@example.com',
+                username=f'author{number}',
+                password='password',
+                first_name='Имя',
+                last_name='Фамилия'
+            )
+            for number in range(3)
+        ]
+        cls.user = authors[0]
+        Subscription.objects.create(user=cls.user, author=authors[1])
+        tags = [
+            Tag.objects.create(name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(3)
+        ]
+        ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(10)
+        ]
+        for number in range(RECIPES_COUNT):
+            recipe = Recipe.objects.create(
+                author=authors[number % len(authors)],
+                name=f'Рецепт {number}',
+                image='recipes_images/recipe.png',
+                text='Описание',
+                cooking_time=10
+            )
+            recipe.tags.set(tags[:number % len(tags) + 1])
+            RecipeIngredient.objects.bulk_create(
+                RecipeIngredient(
+                    recipe=recipe,
+                    ingredient=ingredients[(number + shift) % 10],
+                    amount=shift + 1
+                )
+                for shift in range(3)
+            )
+            if number % 2:
+                Favorite.objects.create(user=cls.user, recipe=recipe)
+                ShoppingList.objects.create(user=cls.user, recipe=recipe)
+        cls.recipe = recipe
+
+    def setUp(self):
+        cache.clear()
+
+    def assert_list_queries(self, viewer):
+        for limit in (6, 50):
+            with self.subTest(limit=limit):
+                with self.assertNumQueries(LIST_QUERIES[viewer]):
+                    response = self.client.get(
+                        '/api/recipes/', {'limit': limit}
+                    )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), limit)
+
+    def assert_detail_queries(self, viewer):
+        with self.assertNumQueries(DETAIL_QUERIES[viewer]):
+            response = self.client.get(f'/api/recipes/{self.recipe.pk}/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_anonymous(self):
+        self.assert_list_queries('anonymous')
+
+    def test_list_authenticated(self):
+        self.client.force_authenticate(self.user)
+        self.assert_list_queries('authenticated')
+
+    def test_retrieve_anonymous(self):
+        self.assert_detail_queries('anonymous')
+
+    def test_retrieve_authenticated(self):
+        self.client.force_authenticate(self.user)
+        self.assert_detail_queries('authenticated')
@@ -0,0 +1,14 @@
+from rest_framework.test import APITestCase
+
+URL = '/api/recipes/download_shopping_cart/'
+
+
+class ShoppingCartDownloadErrorTest(APITestCase):
+
+    def test_errors_are_rendered_as_json(self):
+        for accept in ('application/pdf', 'text/plain', 'text/csv'):
+            with self.subTest(accept=accept):
+                response = self.client.get(URL, HTTP_ACCEPT=accept)
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertIn('detail', response.json())
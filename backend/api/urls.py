@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from api.views import (
     IngredientViewSet,
+    JobViewSet,
     RecipeViewSet,
     RedirectView,
     TagViewSet,
@@ -15,6 +16,7 @@ router.register('users', UserViewSet)
 router.register('ingredients', IngredientViewSet)
 router.register('recipes', RecipeViewSet)
 router.register('tags', TagViewSet)
+router.register('jobs', JobViewSet, basename='jobs')
 
 
 urlpatterns = [
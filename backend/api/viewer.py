@@ -0,0 +1,88 @@
+from django.db.models import Manager
+from rest_framework import serializers
+
+from recipes.models import Favorite, ShoppingList
+from users.models import Subscription
+
+
+class IdSetLoader:
+    """Множество id, загружаемое по требованию одним запросом на пачку.
+
+    Id, заранее переданные в prime(), загружаются вместе при первой
+    проверке, поэтому страница из N объектов стоит одного запроса.
+    """
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.pending = set()
+        self.loaded = set()
+        self.found = set()
+
+    def prime(self, ids):
+        self.pending.update(set(ids) - self.loaded)
+
+    def __contains__(self, pk):
+        if pk not in self.loaded:
+            self.pending.add(pk)
+            self.found.update(self.queryset.filter(
+                **{f'{self.field}__in': self.pending}
+            ).values_list(self.field, flat=True))
+            self.loaded |= self.pending
+            self.pending = set()
+        return pk in self.found
+
+
+class ViewerState:
+    """Избранное, корзина и подписки пользователя в рамках запроса."""
+
+    def __init__(self, user):
+        self.is_anonymous = user.is_anonymous
+        if self.is_anonymous:
+            return
+        self.favorites = IdSetLoader(
+            Favorite.objects.filter(user=user), 'recipe_id'
+        )
+        self.shopping_cart = IdSetLoader(
+            ShoppingList.objects.filter(user=user), 'recipe_id'
+        )
+        self.followed = IdSetLoader(
+            Subscription.objects.filter(user=user), 'author_id'
+        )
+
+    def prime(self, recipe_ids=(), author_ids=()):
+        if self.is_anonymous:
+            return
+        self.favorites.prime(recipe_ids)
+        self.shopping_cart.prime(recipe_ids)
+        self.followed.prime(author_ids)
+
+    def is_favorited(self, recipe_id):
+        return not self.is_anonymous and recipe_id in self.favorites
+
+    def is_in_shopping_cart(self, recipe_id):
+        return not self.is_anonymous and recipe_id in self.shopping_cart
+
+    def is_subscribed(self, author_id):
+        return not self.is_anonymous and author_id in self.followed
+
+
+def get_viewer_state(context):
+    request = context.get('request')
+    if request is None:
+        return None
+    if getattr(request, 'viewer_state', None) is None:
+        request.viewer_state = ViewerState(request.user)
+    return request.viewer_state
+
+
+class ViewerStateListSerializer(serializers.ListSerializer):
+    """Передает id всей страницы в ViewerState до сериализации."""
+
+    def to_representation(self, data):
+        items = data.all() if isinstance(data, Manager) else data
+        items = list(items)
+        viewer = get_viewer_state(self.context)
+        if viewer is not None:
+            self.child.prime_viewer_state(viewer, items)
+        return super().to_representation(items)
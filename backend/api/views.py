@@ -1,28 +1,48 @@
-from django.db.models import Sum
+from io import SEEK_END, BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Value
 from django_filters.rest_framework import DjangoFilterBackend
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils import baseconv
+from django.utils.http import content_disposition_header
 from django.views import View
 from djoser.serializers import SetPasswordSerializer
+from rest_framework import renderers
 from rest_framework import status
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser
 from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 from rest_framework.response import Response
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
-
-from api.constants import (
-    PDFFONTIZE,
-    PDFTEXTBEGINX,
-    PDFTEXTBEGINY,
-    PDFHEADBEGINY
+
+from api.cache import (
+    INGREDIENTS,
+    RECIPES,
+    TAGS,
+    bump_version,
+    cache_anonymous_response,
+    conditional_get,
+    shopping_cart,
+    user_state,
+    versioned_key
 )
+from api.constants import PDFCACHEMAXSIZE
+from api.exports import EXPORTERS, get_shopping_cart_ingredients
 from api.filters import IngredientFilter, RecipeFilter
 from api.pagination import LimitedPagination
+from api.parsers import MultiPartJSONParser
+from api.renderers import (
+    CSVRenderer,
+    JSONRenderer,
+    PDFRenderer,
+    PlainTextRenderer,
+    ShoppingCartRenderer
+)
 from api.permissions import (
     AdminOrReadOnly,
     IsAdminOrAuthor,
@@ -31,9 +51,12 @@ from api.permissions import (
 from api.serializers import (
     FavoriteSerializer,
     IngredientSerializer,
+    JobSerializer,
+    RecipeIdsSerializer,
     RecipeReadSerializer,
     RecipeWriteSerializer,
     ShoppingListSerializer,
+    ShortRecipeListSerializer,
     SubscribeSerializer,
     SubscriptionSerializer,
     TagSerializer,
@@ -41,11 +64,13 @@ from api.serializers import (
     UserReadSerializer,
     UserWriteSerializer
 )
+from jobs.models import Job
+from jobs.queue import enqueue
+from recipes.counters import change_recipe_counters
 from recipes.models import (
     Favorite,
     Ingredient,
     Recipe,
-    RecipeIngredient,
     ShoppingList,
     Tag
 )
@@ -53,12 +78,26 @@ from recipes.models import (
 from users.models import Subscription, User
 
 
+def get_recipe_namespaces(request):
+    if request.user.is_authenticated:
+        return (RECIPES, user_state(request.user.pk))
+    return (RECIPES,)
+
+
 class TagViewSet(viewsets.ModelViewSet):
     queryset = Tag.objects.all().order_by('name')
     serializer_class = TagSerializer
     permission_classes = (AdminOrReadOnly,)
     pagination_class = None
 
+    @conditional_get(lambda request: (TAGS,))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get(lambda request: (TAGS,))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 class IngredientViewSet(viewsets.ModelViewSet):
     queryset = Ingredient.objects.all().order_by('name')
@@ -68,6 +107,36 @@ class IngredientViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
 
+    @conditional_get(lambda request: (INGREDIENTS,))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get(lambda request: (INGREDIENTS,))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = JobSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return Job.objects.filter(user=self.request.user)
+
+    @action(detail=True, methods=('get',), url_path='download')
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != Job.DONE or not job.result:
+            return Response(
+                'Результат задачи еще не готов.',
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            job.result.open('rb'),
+            as_attachment=True,
+            filename='Список.pdf'
+        )
+
 
 class RecipeViewSet(viewsets.ModelViewSet):
     queryset = Recipe.objects.all().order_by('-pub_date')
@@ -75,6 +144,14 @@ class RecipeViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
     pagination_class = LimitedPagination
+    parser_classes = (JSONParser, FormParser, MultiPartJSONParser)
+    keyset_ordering = ('-pub_date', '-id')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            return queryset.for_reading(self.request.user)
+        return queryset
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
@@ -85,95 +162,201 @@ class RecipeViewSet(viewsets.ModelViewSet):
             return FavoriteSerializer
         return RecipeWriteSerializer
 
+    @cache_anonymous_response(RECIPES)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get(get_recipe_namespaces)
+    @cache_anonymous_response(RECIPES)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def handle_exception(self, exc):
+        response = super().handle_exception(exc)
+        if any(
+            isinstance(renderer, ShoppingCartRenderer)
+            for renderer in self.get_renderers()
+        ):
+            self.request.accepted_renderer = renderers.JSONRenderer()
+            self.request.accepted_media_type = (
+                self.request.accepted_renderer.media_type
+            )
+        return response
+
     def handle_favorite_shopping_cart(
             self, request, pk, model_class, serializer_class
     ):
         user = request.user
-        recipe = get_object_or_404(Recipe, id=pk)
-        object_data = model_class.objects.filter(user=user, recipe=recipe)
         if request.method == 'POST':
-            if object_data.exists():
+            recipe = get_object_or_404(Recipe, id=pk)
+            try:
+                with transaction.atomic():
+                    obj = model_class.objects.create(user=user, recipe=recipe)
+            except IntegrityError:
                 return Response(
                     'Вы уже добавили этот рецепт',
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            obj = model_class.objects.create(user=user, recipe=recipe)
             serializer = serializer_class(
                 obj, context={'request': request}
             )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
-        if not object_data.exists():
+        deleted, _ = model_class.objects.filter(
+            user=user, recipe_id=pk
+        ).delete()
+        if not deleted:
+            get_object_or_404(Recipe, id=pk)
             return Response(
                 {'errors': 'Вы не добавляли этот рецепт'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        object_data.delete()
         return Response(
-            f'Рецепт "{recipe.name}" успешно удален',
+            'Рецепт успешно удален',
             status=status.HTTP_204_NO_CONTENT
         )
 
+    def handle_bulk_favorite_shopping_cart(self, request, model_class):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = serializer.validated_data['recipes']
+        user = request.user
+        with transaction.atomic():
+            if request.method == 'DELETE':
+                changed = model_class.objects.bulk_remove(user, recipe_ids)
+                delta = -1
+            else:
+                changed = model_class.objects.bulk_add(user, recipe_ids)
+                delta = 1
+            if changed:
+                change_recipe_counters(model_class, changed, delta)
+        if changed:
+            bump_version(user_state(user.pk))
+            if model_class is ShoppingList:
+                bump_version(shopping_cart(user.pk))
+        if request.method == 'DELETE':
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(
+            ShortRecipeListSerializer(
+                Recipe.objects.filter(pk__in=recipe_ids),
+                many=True,
+                context={'request': request}
+            ).data,
+            status=status.HTTP_201_CREATED
+        )
+
     @action(
         detail=True,
         methods=('post', 'delete'),
         url_path='favorite',
+        permission_classes=(IsAuthenticated,)
     )
     def get_delete_favorite(self, request, pk=None):
         return self.handle_favorite_shopping_cart(
             request, pk, Favorite, FavoriteSerializer
         )
 
+    @action(
+        detail=False,
+        methods=('post', 'delete'),
+        url_path='favorite',
+        url_name='favorite-bulk',
+        permission_classes=(IsAuthenticated,)
+    )
+    def bulk_favorite(self, request):
+        return self.handle_bulk_favorite_shopping_cart(request, Favorite)
+
     @action(
         detail=False,
         methods=('get',),
         url_path='download_shopping_cart',
-        permission_classes=(IsAuthenticated,)
+        permission_classes=(IsAuthenticated,),
+        renderer_classes=(
+            PDFRenderer,
+            PlainTextRenderer,
+            CSVRenderer,
+            JSONRenderer
+        )
     )
     def download_shopping_cart(self, request):
-        ingredients = RecipeIngredient.objects.filter(
-            recipe__shopping_list__user=request.user
-        ).order_by('ingredient__name').values(
-            'ingredient__name', 'ingredient__measurement_unit'
-        ).annotate(total_amount=Sum('amount'))
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="Список.pdf"'
-        p = canvas.Canvas(response)
-        pdfmetrics.registerFont(TTFont('DejaVuSans', 'DejaVuSans.ttf'))
-        pdfmetrics.registerFont(
-            TTFont('DejaVuSans-Bold', 'DejaVuSans-Bold.ttf')
-        )
-        text_object = p.beginText(PDFTEXTBEGINX, PDFTEXTBEGINY)
-        text_object.setFont('DejaVuSans', PDFFONTIZE)
-        p.setFont('DejaVuSans-Bold', PDFFONTIZE)
-        for item in ingredients:
-            text_object.textLine(
-                f'{item["ingredient__name"]} '
-                f'({item["ingredient__measurement_unit"]}) - '
-                f'{item["total_amount"]}'
+        ingredients = get_shopping_cart_ingredients(request.user)
+        export_format = request.accepted_renderer.format
+        if export_format == 'pdf':
+            return self.get_shopping_cart_pdf(request, ingredients)
+        response = StreamingHttpResponse(
+            EXPORTERS[export_format](ingredients),
+            content_type=(
+                f'{request.accepted_renderer.media_type}; charset=utf-8'
             )
-        p.drawString(
-            PDFTEXTBEGINX,
-            PDFHEADBEGINY,
-            'Список ингредиентов для сохраненных рецептов'
         )
-        p.drawText(text_object)
-        p.showPage()
-        p.save()
+        response['Content-Disposition'] = content_disposition_header(
+            True, f'Список.{export_format}'
+        )
         return response
 
+    def get_shopping_cart_pdf(self, request, ingredients):
+        from api.pdf import render_shopping_list
+
+        key = versioned_key(
+            f'shopping-cart-pdf:{request.user.pk}',
+            shopping_cart(request.user.pk),
+            RECIPES
+        )
+        content = cache.get(key)
+        if content is None:
+            file = render_shopping_list(ingredients)
+            if file.seek(0, SEEK_END) <= PDFCACHEMAXSIZE:
+                file.seek(0)
+                content = file.read()
+                cache.set(key, content, settings.RESPONSE_CACHE_TIMEOUT)
+            file.seek(0)
+        else:
+            file = BytesIO(content)
+        return FileResponse(
+            file,
+            as_attachment=True,
+            filename='Список.pdf',
+            content_type='application/pdf'
+        )
+
+    @action(
+        detail=False,
+        methods=('post',),
+        url_path='download_shopping_cart_async',
+        permission_classes=(IsAuthenticated,)
+    )
+    def download_shopping_cart_async(self, request):
+        job = enqueue(
+            'api.tasks.render_shopping_cart_pdf', user=request.user
+        )
+        return Response(
+            JobSerializer(job, context={'request': request}).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+
     @action(
         detail=True,
         methods=('post', 'delete'),
         url_path='shopping_cart',
+        permission_classes=(IsAuthenticated,)
     )
     def shopping_list(self, request, pk=None):
         return self.handle_favorite_shopping_cart(
             request, pk, ShoppingList, ShoppingListSerializer
         )
 
+    @action(
+        detail=False,
+        methods=('post', 'delete'),
+        url_path='shopping_cart',
+        url_name='shopping-cart-bulk',
+        permission_classes=(IsAuthenticated,)
+    )
+    def bulk_shopping_list(self, request):
+        return self.handle_bulk_favorite_shopping_cart(request, ShoppingList)
+
     @action(detail=True, methods=('get',), url_path='get-link')
     def get_link(self, request, pk=None):
         get_object_or_404(Recipe, pk=pk)
@@ -197,6 +380,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('-date_joined')
     permission_classes = (IsAuthorOrAdminOrReadOnly, )
     pagination_class = LimitedPagination
+    keyset_ordering = ('-date_joined', '-id')
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve'] or self.action == 'get_me':
@@ -239,7 +423,8 @@ class UserViewSet(viewsets.ModelViewSet):
         methods=('put', 'patch', 'delete'),
         url_path='me/avatar',
         url_name='me-avatar',
-        permission_classes=(IsAuthenticated,)
+        permission_classes=(IsAuthenticated,),
+        parser_classes=(JSONParser, FormParser, MultiPartJSONParser)
     )
     def update_delete_avatar(self, request):
         if request.method == 'PATCH' or request.method == 'PUT':
@@ -305,7 +490,15 @@ class UserViewSet(viewsets.ModelViewSet):
 
     )
     def subscriptions(self, request):
-        authors = User.objects.filter(subscribers__user=request.user)
+        authors = User.objects.filter(
+            subscribers__user=request.user
+        ).annotate(is_subscribed=Value(True)).prefetch_related(Prefetch(
+            'recipes',
+            queryset=SubscriptionSerializer.get_recipes_queryset(
+                request, Recipe.objects.all()
+            ),
+            to_attr='short_recipes'
+        )).order_by('username')
         serializer = SubscriptionSerializer(
             self.paginate_queryset(authors),
             context={'request': request},
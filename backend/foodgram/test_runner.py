@@ -0,0 +1,31 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TemporaryCacheRunner(DiscoverRunner):
+    """Тесты работают с кешем во временной директории.
+
+    Файловый кеш общий для процессов и переживает перезапуск, поэтому без
+    этого тесты видели бы версии и ответы, закешированные разработческим
+    сервером или предыдущим запуском тестов.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_dir = tempfile.mkdtemp(prefix='foodgram-cache-')
+        self.cache_settings = override_settings(CACHES={
+            **settings.CACHES,
+            'default': {
+                **settings.CACHES['default'], 'LOCATION': self.cache_dir
+            },
+        })
+        self.cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_settings.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
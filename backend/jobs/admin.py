@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'user', 'created', 'finished')
+    list_filter = ('status', 'task')
+    list_select_related = ('user',)
+    readonly_fields = ('created', 'started', 'finished')
@@ -0,0 +1,3 @@
+TASK_MAX_LENGTH = 255
+STATUS_MAX_LENGTH = 16
+STALE_JOB_GRACE = 60
@@ -0,0 +1,93 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import (
+    claim,
+    fail_running,
+    init_worker,
+    purge_finished,
+    release,
+    run_job_in_worker
+)
+
+POLL_INTERVAL = 1.0
+PURGE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = 'Выполнение фоновых задач из очереди в пуле процессов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            default=os.cpu_count() or 1,
+            type=int,
+            help='Количество процессов'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            default=POLL_INTERVAL,
+            type=float,
+            help='Пауза между проверками пустой очереди, с'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить задачи из очереди и завершиться'
+        )
+
+    def handle(self, *args, **options):
+        connections.close_all()
+        self.running = {}
+        self.next_purge = time.monotonic()
+        while True:
+            try:
+                return self.run_pool(options)
+            except BrokenProcessPool as error:
+                # Процесс пула убит (например, OOM killer): задачи, которые
+                # в нем выполнялись, отмечаются ошибкой, пул создается заново.
+                self.stderr.write(f'Пул процессов остановлен: {error}')
+                for pk in self.running.values():
+                    fail_running(pk, f'Процесс воркера остановлен: {error}')
+                self.running = {}
+
+    def run_pool(self, options):
+        workers = options['workers']
+        running = self.running
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            while True:
+                if time.monotonic() >= self.next_purge:
+                    purge_finished()
+                    self.next_purge = time.monotonic() + PURGE_INTERVAL
+                while len(running) < workers:
+                    pk = claim()
+                    if pk is None:
+                        break
+                    try:
+                        future = pool.submit(run_job_in_worker, pk)
+                    except BrokenProcessPool:
+                        release(pk)
+                        raise
+                    running[future] = pk
+                if not running and options['once']:
+                    return
+                done, _ = wait(
+                    running,
+                    timeout=options['poll_interval'],
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    pk = running.pop(future)
+                    try:
+                        self.stdout.write(f'Задача {pk}: {future.result()}')
+                    except Exception as error:
+                        message = f'{type(error).__name__}: {error}'
+                        fail_running(pk, message)
+                        self.stderr.write(
+                            f'Задача {pk}: ошибка воркера {message}'
+                        )
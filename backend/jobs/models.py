@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db import models
+
+from jobs.constants import STATUS_MAX_LENGTH, TASK_MAX_LENGTH
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    task = models.CharField('Задача', max_length=TASK_MAX_LENGTH)
+    kwargs = models.JSONField('Параметры', default=dict, blank=True)
+    status = models.CharField(
+        'Статус',
+        max_length=STATUS_MAX_LENGTH,
+        choices=STATUS_CHOICES,
+        default=QUEUED
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='jobs',
+        verbose_name='Пользователь',
+        null=True,
+        blank=True
+    )
+    result = models.FileField(
+        'Результат',
+        upload_to='jobs/',
+        blank=True
+    )
+    error = models.TextField('Ошибка', blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    started = models.DateTimeField('Запущена', null=True, blank=True)
+    finished = models.DateTimeField('Завершена', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('-created',)
+        indexes = (
+            models.Index(
+                fields=('status', 'created'),
+                name='job_status_created_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.task} ({self.get_status_display()})'
@@ -0,0 +1,124 @@
+import signal
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from jobs.constants import STALE_JOB_GRACE
+from jobs.models import Job
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def enqueue(task, user=None, **kwargs):
+    job = Job.objects.create(task=task, user=user, kwargs=kwargs)
+    if settings.JOBS_RUN_SYNC:
+        run_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def enqueue_once(task, user=None, **kwargs):
+    """Поставить задачу, если такая же еще не ждет и не выполняется."""
+    job = Job.objects.filter(
+        task=task,
+        user=user,
+        kwargs=kwargs,
+        status__in=(Job.QUEUED, Job.RUNNING)
+    ).first()
+    if job is not None:
+        return job
+    return enqueue(task, user=user, **kwargs)
+
+
+def claim():
+    """Перевести самую старую задачу из очереди в работу.
+
+    Задачи, зависшие в работе дольше JOB_TIMEOUT секунд (например, после
+    падения воркера), снова становятся доступны для выполнения. Запас
+    STALE_JOB_GRACE нужен, чтобы процесс, прерванный по таймауту в
+    run_job_in_worker, успел сохранить статус до повторного захвата.
+    """
+    stale = timezone.now() - timedelta(
+        seconds=settings.JOB_TIMEOUT + STALE_JOB_GRACE
+    )
+    claimable = Q(status=Job.QUEUED) | Q(status=Job.RUNNING, started__lt=stale)
+    while True:
+        pk = Job.objects.filter(claimable).order_by('created').values_list(
+            'pk', flat=True
+        ).first()
+        if pk is None:
+            return None
+        if Job.objects.filter(claimable, pk=pk).update(
+            status=Job.RUNNING, started=timezone.now()
+        ):
+            return pk
+
+
+def run_job(pk):
+    job = Job.objects.filter(pk=pk).first()
+    if job is None:
+        return None
+    try:
+        import_string(job.task)(job)
+    except Exception as error:
+        job.status = Job.FAILED
+        job.error = f'{type(error).__name__}: {error}'
+    else:
+        job.status = Job.DONE
+    job.finished = timezone.now()
+    job.save()
+    return job.status
+
+
+def raise_timeout(signum, frame):
+    raise JobTimeout(
+        f'Задача выполнялась дольше {settings.JOB_TIMEOUT} с'
+    )
+
+
+def run_job_in_worker(pk):
+    """run_job в процессе пула, прерываемый через JOB_TIMEOUT секунд."""
+    if not hasattr(signal, 'SIGALRM'):
+        return run_job(pk)
+    signal.signal(signal.SIGALRM, raise_timeout)
+    signal.alarm(settings.JOB_TIMEOUT)
+    try:
+        return run_job(pk)
+    finally:
+        signal.alarm(0)
+
+
+def fail_running(pk, error):
+    """Отметить ошибкой задачу, процесс которой завершился аварийно."""
+    return Job.objects.filter(pk=pk, status=Job.RUNNING).update(
+        status=Job.FAILED, error=error, finished=timezone.now()
+    )
+
+
+def release(pk):
+    """Вернуть в очередь захваченную, но не запущенную задачу."""
+    return Job.objects.filter(pk=pk, status=Job.RUNNING).update(
+        status=Job.QUEUED, started=None
+    )
+
+
+def purge_finished():
+    """Удалить завершенные задачи старше JOB_RESULT_TTL секунд.
+
+    Файлы результатов после этого удаляет команда cleanup_media.
+    """
+    expired = timezone.now() - timedelta(seconds=settings.JOB_RESULT_TTL)
+    deleted, _ = Job.objects.filter(
+        status__in=(Job.DONE, Job.FAILED), finished__lt=expired
+    ).delete()
+    return deleted
+
+
+def init_worker():
+    connections.close_all()
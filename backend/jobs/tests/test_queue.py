@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim, run_job_in_worker
+
+
+def noop_task(job):
+    pass
+
+
+def slow_task(job):
+    time.sleep(5)
+
+
+class BrokenOncePool:
+    """Пул, первый экземпляр которого ломается, как после OOM killer."""
+
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        BrokenOncePool.created += 1
+        self.broken = BrokenOncePool.created == 1
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def submit(self, function, pk):
+        future = Future()
+        if not self.broken:
+            future.set_result(function(pk))
+            return future
+        self.submitted += 1
+        if self.submitted > 1:
+            raise BrokenProcessPool('процесс убит')
+        future.set_exception(BrokenProcessPool('процесс убит'))
+        return future
+
+
+class RunJobsTest(TestCase):
+
+    def enqueue(self, task):
+        return Job.objects.create(task=f'jobs.tests.test_queue.{task}')
+
+    @override_settings(JOB_TIMEOUT=1)
+    def test_job_is_stopped_after_timeout(self):
+        job = self.enqueue('slow_task')
+        self.assertEqual(claim(), job.pk)
+        started = time.monotonic()
+        self.assertEqual(run_job_in_worker(job.pk), Job.FAILED)
+        self.assertLess(time.monotonic() - started, 3)
+        job.refresh_from_db()
+        self.assertIn('JobTimeout', job.error)
+
+    @override_settings(JOB_TIMEOUT=1)
+    def test_running_job_is_not_claimed_again_within_timeout(self):
+        job = self.enqueue('noop_task')
+        self.assertEqual(claim(), job.pk)
+        Job.objects.filter(pk=job.pk).update(
+            started=timezone.now() - timedelta(seconds=2)
+        )
+        self.assertIsNone(claim())
+
+    def test_broken_pool_is_recreated(self):
+        killed = self.enqueue('noop_task')
+        waiting = self.enqueue('noop_task')
+        BrokenOncePool.created = 0
+        stderr = StringIO()
+        with mock.patch(
+            'jobs.management.commands.run_jobs.ProcessPoolExecutor',
+            BrokenOncePool
+        ):
+            call_command(
+                'run_jobs', '--once', stdout=StringIO(), stderr=stderr
+            )
+        self.assertEqual(BrokenOncePool.created, 2)
+        self.assertIn('Пул процессов остановлен', stderr.getvalue())
+        killed.refresh_from_db()
+        waiting.refresh_from_db()
+        self.assertEqual(killed.status, Job.FAILED)
+        self.assertEqual(waiting.status, Job.DONE)
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Q
 
 from recipes.models import (
     Favorite,
@@ -9,6 +10,7 @@ from recipes.models import (
     ShoppingList,
     Tag
 )
+from users.models import User
 
 
 @admin.register(Tag)
@@ -47,7 +49,8 @@ class RecipeIngredientInline(admin.TabularInline):
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
-    search_fields = ('author', 'name')
+    search_fields = ('^name', '^author__username')
+    search_help_text = 'Начало названия рецепта или имени автора'
     list_display = (
         'id',
         'name',
@@ -59,22 +62,40 @@ class RecipeAdmin(admin.ModelAdmin):
         'get_ingredients'
     )
     list_filter = ('tags',)
+    list_select_related = ('author',)
+    show_full_result_count = False
     filter_horizontal = ('tags', 'ingredients')
     inlines = (RecipeIngredientInline, RecipeTagInline)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related(
+            'tags', 'ingredients'
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        # Строка ищется целиком, а не по словам, как в ModelAdmin:
+        # иначе каждое слово должно найтись в начале одного из полей.
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        return queryset.filter(
+            Q(name__istartswith=term)
+            | Q(author__in=User.objects.filter(username__istartswith=term))
+        ), False
+
     @admin.display(description='В избранном')
     def get_is_favorite(self, obj):
-        return Favorite.objects.filter(recipe=obj).count()
+        return obj.favorites_count
 
     @admin.display(description='Теги')
     def get_tags(self, obj):
-        tags = obj.tags.values_list('name', flat=True)
-        return ', '.join(tags)
+        return ', '.join(tag.name for tag in obj.tags.all())
 
     @admin.display(description='Ингредиенты')
     def get_ingredients(self, obj):
-        ingredients = obj.ingredients.values_list('name', flat=True)
-        return ', '.join(ingredients)
+        return ', '.join(
+            ingredient.name for ingredient in obj.ingredients.all()
+        )
 
 
 @admin.register(Favorite)
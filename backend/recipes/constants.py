@@ -4,5 +4,8 @@ MIN_INGREDIENTS_AMOUNT = 1
 MIN_INGREDIENTS_NUMBER = 1
 MIN_TAGS_NUMBER = 1
 NAME_LENGHT = 256
+IMAGE_NAME_LENGHT = 100
 TAG_NAME_LENGHT = 32
 MEASUREMENT_UNIT_LENGHT = 64
+SEARCH_CONFIG = 'russian'
+FTS_NAME_WEIGHT = 10.0
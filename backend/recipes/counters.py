@@ -0,0 +1,51 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from recipes.models import Favorite, Recipe, ShoppingList
+from users.models import Subscription, User
+
+RECIPE_COUNTERS = {
+    Favorite: 'favorites_count',
+    ShoppingList: 'in_carts_count',
+}
+
+
+def change_counter(queryset, field, delta):
+    value = F(field) + delta
+    if delta < 0:
+        value = Greatest(value, 0)
+    return queryset.update(**{field: value})
+
+
+def change_recipe_counters(model, recipe_ids, delta):
+    return change_counter(
+        Recipe.objects.filter(pk__in=recipe_ids),
+        RECIPE_COUNTERS[model],
+        delta
+    )
+
+
+def count_by(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}).order_by().values(
+            field
+        ).annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def refresh_recipe_counters(recipes=None):
+    if recipes is None:
+        recipes = Recipe.objects.all()
+    return recipes.update(
+        favorites_count=count_by(Favorite, 'recipe'),
+        in_carts_count=count_by(ShoppingList, 'recipe')
+    )
+
+
+def refresh_user_counters(users=None):
+    if users is None:
+        users = User.objects.all()
+    return users.update(
+        recipes_count=count_by(Recipe, 'author'),
+        subscribers_count=count_by(Subscription, 'author')
+    )
@@ -0,0 +1,182 @@
+import io
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from PIL import Image
+
+from api.cache import INGREDIENTS, RECIPES, TAGS, bump_version
+from recipes.counters import refresh_recipe_counters, refresh_user_counters
+from recipes.models import (
+    Favorite,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    RecipeTag,
+    ShoppingList,
+    Tag
+)
+from users.models import Subscription, User
+
+BATCH_SIZE = 1000
+PASSWORD = 'fake-password'
+WORDS = (
+    'борщ', 'суп', 'салат', 'пирог', 'каша', 'рагу', 'паста', 'оладьи',
+    'свекла', 'капуста', 'морковь', 'картофель', 'лук', 'чеснок', 'тыква',
+    'фасоль', 'чечевица', 'нут', 'рис', 'гречка', 'овсянка', 'томаты',
+    'грибы', 'шпинат', 'яблоки', 'ягоды', 'орехи', 'тофу', 'соус', 'запечь',
+    'обжарить', 'потушить', 'сварить', 'нарезать', 'смешать', 'подавать',
+)
+
+
+class Command(BaseCommand):
+    help = 'Генерация синтетических данных для нагрузочного тестирования'
+
+    def add_arguments(self, parser):
+        for name, default, help_text in (
+            ('users', 100, 'Количество пользователей'),
+            ('recipes', 1000, 'Количество рецептов'),
+            ('tags', 10, 'Минимальное количество тегов'),
+            ('ingredients', 500, 'Минимальное количество ингредиентов'),
+            ('ingredients-per-recipe', 6, 'Ингредиентов в рецепте'),
+            ('tags-per-recipe', 2, 'Тегов у рецепта'),
+            ('favorites', 5000, 'Записей в избранном'),
+            ('cart', 2000, 'Записей в списках покупок'),
+            ('subscriptions', 500, 'Подписок'),
+            ('seed', 0, 'Зерно генератора случайных чисел'),
+            ('batch-size', BATCH_SIZE, 'Количество строк в одном INSERT'),
+        ):
+            parser.add_argument(
+                f'--{name}', default=default, type=int, help=help_text
+            )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.monotonic()
+        with transaction.atomic():
+            users = self.create_users(options['users'], options['seed'])
+            tags = self.create_tags(options['tags'])
+            ingredients = self.create_ingredients(options['ingredients'])
+            recipes = self.create_recipes(options['recipes'], users)
+            self.link(
+                RecipeTag, recipes, 'recipe', tags, 'tags',
+                options['tags_per_recipe']
+            )
+            self.link(
+                RecipeIngredient, recipes, 'recipe', ingredients,
+                'ingredient', options['ingredients_per_recipe'],
+                amount=lambda: self.random.randint(1, 500)
+            )
+            for model, total in (
+                (Favorite, options['favorites']),
+                (ShoppingList, options['cart']),
+            ):
+                self.create_pairs(
+                    model, total, users, 'user', recipes, 'recipe'
+                )
+            self.create_pairs(
+                Subscription, options['subscriptions'], users, 'user',
+                users, 'author'
+            )
+            refresh_recipe_counters()
+            refresh_user_counters()
+        for namespace in (INGREDIENTS, RECIPES, TAGS):
+            bump_version(namespace)
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано пользователей: {len(users)}, рецептов: '
+            f'{len(recipes)} за {time.monotonic() - started:.1f} с'
+        ))
+
+    def bulk_create(self, model, objects):
+        return model.objects.bulk_create(
+            objects, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+    def create_users(self, total, seed):
+        password = make_password(PASSWORD)
+        usernames = [f'fake_{seed}_{number}' for number in range(total)]
+        self.bulk_create(User, [
+            User(
+                username=username,
+                email=f'{username}@example.com',
+                password=password,
+                first_name=self.random.choice(WORDS).title(),
+                last_name=self.random.choice(WORDS).title()
+            )
+            for username in usernames
+        ])
+        return list(User.objects.filter(username__in=usernames))
+
+    def create_tags(self, total):
+        existing = Tag.objects.count()
+        self.bulk_create(Tag, [
+            Tag(name=f'Тег {number}', slug=f'fake-{number}')
+            for number in range(existing, total)
+        ])
+        return list(Tag.objects.all())
+
+    def create_ingredients(self, total):
+        existing = Ingredient.objects.count()
+        self.bulk_create(Ingredient, [
+            Ingredient(
+                name=f'{self.random.choice(WORDS)} {number}',
+                measurement_unit=self.random.choice(('г', 'мл', 'шт.'))
+            )
+            for number in range(existing, total)
+        ])
+        return list(Ingredient.objects.all())
+
+    def create_image(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), (120, 160, 90)).save(buffer, 'JPEG')
+        return default_storage.save(
+            'recipes_images/fake.jpg', ContentFile(buffer.getvalue())
+        )
+
+    def create_recipes(self, total, users):
+        image = self.create_image()
+        recipes = []
+        for _ in range(total):
+            words = self.random.sample(WORDS, 12)
+            recipes.append(Recipe(
+                author=self.random.choice(users),
+                name=' '.join(words[:3]).capitalize(),
+                text=' '.join(words[3:]).capitalize() + '.',
+                image=image,
+                cooking_time=self.random.randint(5, 180)
+            ))
+        return Recipe.objects.bulk_create(recipes, batch_size=self.batch_size)
+
+    def link(self, model, recipes, recipe_field, targets, target_field,
+             per_recipe, **values):
+        per_recipe = min(per_recipe, len(targets))
+        self.bulk_create(model, [
+            model(**{
+                recipe_field: recipe,
+                target_field: target,
+                **{name: value() for name, value in values.items()}
+            })
+            for recipe in recipes
+            for target in self.random.sample(targets, per_recipe)
+        ])
+
+    def create_pairs(self, model, total, left, left_field, right,
+                     right_field):
+        available = len(left) * len(right)
+        if left is right:
+            available -= len(left)
+        pairs = set()
+        while len(pairs) < min(total, available):
+            first = self.random.choice(left)
+            second = self.random.choice(right)
+            if first != second:
+                pairs.add((first, second))
+        self.bulk_create(model, [
+            model(**{left_field: first, right_field: second})
+            for first, second in pairs
+        ])
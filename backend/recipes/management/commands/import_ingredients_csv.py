@@ -1,11 +1,20 @@
 import csv
+import json
 import logging
 import os
+import time
+from itertools import islice
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 
-from recipes.models import Ingredient
+from api.cache import (
+    INGREDIENTS,
+    bump_version,
+    is_shared_between_processes
+)
+from recipes.models import Ingredient, RecipeIngredient
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,10 +24,27 @@ logging.basicConfig(
 )
 
 DATA_ROOT = os.path.join(settings.BASE_DIR, 'data')
+BATCH_SIZE = 1000
+
+
+def read_csv(file):
+    for name, measurement_unit in csv.reader(file):
+        yield name, measurement_unit
+
+
+def read_json(file):
+    for item in json.load(file):
+        yield item['name'], item['measurement_unit']
+
+
+READERS = {
+    '.csv': read_csv,
+    '.json': read_json,
+}
 
 
 class Command(BaseCommand):
-    help = 'Загрузка ингредиентов из csv-файла в базу даанных'
+    help = 'Загрузка ингредиентов из csv- или json-файла в базу данных'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -27,21 +53,88 @@ class Command(BaseCommand):
             nargs='?',
             type=str
         )
+        parser.add_argument(
+            '--batch-size',
+            default=BATCH_SIZE,
+            type=int,
+            help='Количество строк в одном INSERT'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Выполнить загрузку и откатить транзакцию'
+        )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help='Удалить существующие ингредиенты перед загрузкой'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help=(
+                'Вместе с --truncate удалить ингредиенты, даже если они '
+                'используются в рецептах'
+            )
+        )
 
     def handle(self, *args, **options):
+        filename = options['filename']
+        reader = READERS.get(os.path.splitext(filename)[1].lower())
+        if reader is None:
+            raise CommandError('Поддерживаются только файлы csv и json')
+        if (
+            options['truncate'] and not options['force']
+            and RecipeIngredient.objects.exists()
+        ):
+            raise CommandError(
+                'Ингредиенты используются в рецептах: --truncate удалит их '
+                'из всех рецептов. Добавьте --force, чтобы продолжить'
+            )
+        started = time.monotonic()
         try:
             with open(
-                os.path.join(DATA_ROOT, options['filename']),
+                os.path.join(DATA_ROOT, filename),
                 newline='',
                 encoding='utf8'
-            ) as csv_file:
-                data = csv.reader(csv_file)
-                for row in data:
-                    name, measurement_unit = row
-                    Ingredient.objects.get_or_create(
-                        name=name,
-                        measurement_unit=measurement_unit
-                    )
+            ) as file, transaction.atomic():
+                if options['truncate']:
+                    Ingredient.objects.all().delete()
+                before = Ingredient.objects.count()
+                total = self.load(reader(file), options['batch_size'])
+                inserted = Ingredient.objects.count() - before
+                if options['dry_run']:
+                    transaction.set_rollback(True)
         except FileNotFoundError:
-            raise CommandError('Добавьте файл ingredients в директорию data')
-        logging.info('Данные успешно добавлены')
+            raise CommandError(f'Добавьте файл {filename} в директорию data')
+        except (ValueError, KeyError) as error:
+            raise CommandError(f'Некорректный формат файла: {error}')
+        if not options['dry_run']:
+            bump_version(INGREDIENTS)
+            if not is_shared_between_processes():
+                self.stderr.write(self.style.WARNING(
+                    'Кеш хранится в памяти процесса и не сбросится на '
+                    'сервере: перезапустите backend'
+                ))
+        elapsed = time.monotonic() - started
+        message = (
+            f'Добавлено: {inserted}, пропущено: {total - inserted}, '
+            f'{total / elapsed:.0f} строк/с'
+        )
+        if options['dry_run']:
+            message = f'[dry-run] {message}'
+        self.stdout.write(self.style.SUCCESS(message))
+        logging.info(message)
+
+    @staticmethod
+    def load(rows, batch_size):
+        total = 0
+        while True:
+            batch = [
+                Ingredient(name=name, measurement_unit=measurement_unit)
+                for name, measurement_unit in islice(rows, batch_size)
+            ]
+            if not batch:
+                return total
+            Ingredient.objects.bulk_create(batch, ignore_conflicts=True)
+            total += len(batch)
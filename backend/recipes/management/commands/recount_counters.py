@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.counters import refresh_recipe_counters, refresh_user_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчет счетчиков избранного, покупок, рецептов и подписчиков'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            recipes = refresh_recipe_counters()
+            users = refresh_user_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано рецептов: {recipes}, пользователей: {users}'
+        ))
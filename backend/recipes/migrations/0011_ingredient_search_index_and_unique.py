@@ -0,0 +1,89 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Min
+
+UPPER_NAME_INDEX = 'recipes_ingredient_upper_name_like'
+TRIGRAM_NAME_INDEX = 'recipes_ingredient_upper_name_trgm'
+
+
+def merge_duplicate_ingredients(apps, schema_editor):
+    Ingredient = apps.get_model('recipes', 'Ingredient')
+    RecipeIngredient = apps.get_model('recipes', 'RecipeIngredient')
+    duplicates = Ingredient.objects.values(
+        'name', 'measurement_unit'
+    ).annotate(
+        keep_id=Min('id'), total=Count('id')
+    ).filter(total__gt=1).order_by()
+    for group in duplicates:
+        extra_ids = Ingredient.objects.filter(
+            name=group['name'],
+            measurement_unit=group['measurement_unit']
+        ).exclude(id=group['keep_id']).values_list('id', flat=True)
+        recipe_ids = RecipeIngredient.objects.filter(
+            ingredient_id=group['keep_id']
+        ).values_list('recipe_id', flat=True)
+        RecipeIngredient.objects.filter(
+            ingredient_id__in=extra_ids, recipe_id__in=recipe_ids
+        ).delete()
+        RecipeIngredient.objects.filter(
+            ingredient_id__in=extra_ids
+        ).update(ingredient_id=group['keep_id'])
+        Ingredient.objects.filter(id__in=extra_ids).delete()
+    if schema_editor.connection.vendor == 'postgresql':
+        # Внешние ключи DEFERRABLE INITIALLY DEFERRED: без этого AddConstraint
+        # упадет с "cannot ALTER TABLE because it has pending trigger events".
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {UPPER_NAME_INDEX} '
+        'ON recipes_ingredient (UPPER(name) text_pattern_ops)'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        has_trigram = cursor.fetchone() is not None
+    if has_trigram:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TRIGRAM_NAME_INDEX} '
+            'ON recipes_ingredient USING gin (UPPER(name) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index in (UPPER_NAME_INDEX, TRIGRAM_NAME_INDEX):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_auto_20240907_0740'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipeingredient',
+            name='ingredient',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.ingredient', verbose_name='Ингредиент'),
+        ),
+        migrations.AlterField(
+            model_name='recipeingredient',
+            name='recipe',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='recipes.recipe', verbose_name='Рецепт'),
+        ),
+        migrations.RunPython(
+            merge_duplicate_ingredients, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='ingredient',
+            constraint=models.UniqueConstraint(fields=('name', 'measurement_unit'), name='unique_ingredient_name_unit'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
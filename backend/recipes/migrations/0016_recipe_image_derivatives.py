@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:37
+
+import os
+from importlib import import_module
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+# Имя первой уменьшенной копии, см. api.images.derivative_name.
+FIRST_DERIVATIVE = '_320.webp'
+# AddField в SQLite пересоздает recipes_recipe и теряет триггеры FTS5.
+search = import_module('recipes.migrations.0015_recipe_search')
+restore_search_triggers = search.run_statements(
+    {'sqlite': search.SQLITE_FORWARD}
+)
+
+
+def mark_existing_derivatives(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    for pk, name in Recipe.objects.exclude(image='').exclude(
+        image__isnull=True
+    ).values_list('pk', 'image').iterator():
+        derivative = os.path.splitext(name)[0] + FIRST_DERIVATIVE
+        if default_storage.exists(derivative):
+            Recipe.objects.filter(pk=pk).update(image_derivatives=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0015_recipe_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_search_triggers
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='image_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='Уменьшенные копии созданы для'),
+        ),
+        migrations.RunPython(
+            restore_search_triggers, migrations.RunPython.noop
+        ),
+        migrations.RunPython(
+            mark_existing_derivatives, migrations.RunPython.noop
+        ),
+    ]
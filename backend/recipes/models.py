@@ -1,16 +1,29 @@
-from django.db import models
+import re
+
+from django.db import connections, models
+from django.db.models import (
+    BooleanField,
+    Exists,
+    FloatField,
+    OuterRef,
+    Prefetch
+)
+from django.db.models.expressions import RawSQL
 from django.core.validators import MinValueValidator
 from django.core.validators import RegexValidator
 
 from recipes.constants import (
+    FTS_NAME_WEIGHT,
+    IMAGE_NAME_LENGHT,
     INGREDIENT_NAME_LENGHT,
     MIN_COOKING_TIME,
     NAME_LENGHT,
     MEASUREMENT_UNIT_LENGHT,
     MIN_INGREDIENTS_AMOUNT,
+    SEARCH_CONFIG,
     TAG_NAME_LENGHT
 )
-from users.models import User
+from users.models import Subscription, User
 
 
 class Tag(models.Model):
@@ -57,11 +70,109 @@ class Ingredient(models.Model):
         ordering = ('name',)
         verbose_name = 'ингредиент'
         verbose_name_plural = 'ингредиенты'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('name', 'measurement_unit'),
+                name='unique_ingredient_name_unit')
+        ]
 
     def __str__(self):
         return f'{self.name}'
 
 
+class RecipeQuerySet(models.QuerySet):
+
+    def for_reading(self, user):
+        if user.is_anonymous:
+            return self.select_related('author').prefetch_related(
+                'tags', 'recipe_ingredients__ingredient'
+            )
+        authors = User.objects.annotate(
+            is_subscribed=Exists(Subscription.objects.filter(
+                user=user, author=OuterRef('pk')
+            ))
+        )
+        return self.annotate(
+            is_favorited=Exists(Favorite.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            )),
+            is_in_shopping_cart=Exists(ShoppingList.objects.filter(
+                user=user, recipe=OuterRef('pk')
+            ))
+        ).prefetch_related(
+            Prefetch('author', queryset=authors),
+            'tags',
+            'recipe_ingredients__ingredient'
+        )
+
+    def search(self, query):
+        """Полнотекстовый поиск по названию и описанию с ранжированием.
+
+        В PostgreSQL используется колонка search_vector с GIN-индексом,
+        в SQLite - таблица FTS5 recipes_recipe_fts (см. миграцию 0015).
+        """
+        ordering = ('-search_rank', '-pub_date', '-id')
+        if connections[self.db].vendor != 'postgresql':
+            terms = re.findall(r'\w+', query)
+            if not terms:
+                return self.none()
+            # Таблица FTS5 присоединяется один раз: MATCH выполняется
+            # единожды, а bm25 считается только для найденных строк.
+            return self.extra(
+                tables=('recipes_recipe_fts',),
+                where=(
+                    '"recipes_recipe_fts"."rowid" = "recipes_recipe"."id"',
+                    '"recipes_recipe_fts" MATCH %s',
+                ),
+                params=(' '.join(f'"{term}"*' for term in terms),),
+                select={'search_rank': (
+                    f'-bm25("recipes_recipe_fts", {FTS_NAME_WEIGHT}, 1.0)'
+                )}
+            ).order_by(*ordering)
+        tsquery = 'websearch_to_tsquery(%s::regconfig, %s)'
+        params = (SEARCH_CONFIG, query)
+        return self.filter(RawSQL(
+            f'"recipes_recipe"."search_vector" @@ {tsquery}',
+            params,
+            output_field=BooleanField()
+        )).annotate(search_rank=RawSQL(
+            f'ts_rank_cd("recipes_recipe"."search_vector", {tsquery})',
+            params,
+            output_field=FloatField()
+        )).order_by(*ordering)
+
+
+class UserRecipeQuerySet(models.QuerySet):
+    """Массовые изменения избранного и списка покупок одним запросом.
+
+    Сигналы при этом не отправляются: счетчики и версии кеша обновляет
+    вызывающий код по возвращенным id рецептов.
+    """
+
+    def _returning_recipe_ids(self, sql, params):
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def bulk_add(self, user, recipe_ids):
+        placeholders = ', '.join(['%s'] * len(recipe_ids))
+        return self._returning_recipe_ids(
+            f'INSERT INTO {self.model._meta.db_table} (user_id, recipe_id) '
+            f'SELECT %s, id FROM {Recipe._meta.db_table} '
+            f'WHERE id IN ({placeholders}) '
+            'ON CONFLICT (user_id, recipe_id) DO NOTHING RETURNING recipe_id',
+            (user.pk, *recipe_ids)
+        )
+
+    def bulk_remove(self, user, recipe_ids):
+        placeholders = ', '.join(['%s'] * len(recipe_ids))
+        return self._returning_recipe_ids(
+            f'DELETE FROM {self.model._meta.db_table} WHERE user_id = %s '
+            f'AND recipe_id IN ({placeholders}) RETURNING recipe_id',
+            (user.pk, *recipe_ids)
+        )
+
+
 class Recipe(models.Model):
     author = models.ForeignKey(
         User,
@@ -77,6 +188,13 @@ class Recipe(models.Model):
     image = models.ImageField(
         'Фото блюда',
         upload_to='recipes_images/',
+        max_length=IMAGE_NAME_LENGHT
+    )
+    image_derivatives = models.CharField(
+        'Уменьшенные копии созданы для',
+        max_length=IMAGE_NAME_LENGHT,
+        blank=True,
+        editable=False
     )
     text = models.TextField(
         'Описание блюда',
@@ -103,11 +221,29 @@ class Recipe(models.Model):
     pub_date = models.DateTimeField(
         'Дата публикации',
         auto_now_add=True)
+    favorites_count = models.PositiveIntegerField(
+        'В избранном',
+        default=0,
+        editable=False
+    )
+    in_carts_count = models.PositiveIntegerField(
+        'В списках покупок',
+        default=0,
+        editable=False
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'рецепт'
         verbose_name_plural = 'рецепты'
+        indexes = [
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='recipe_pub_date_id_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.name}'
@@ -167,6 +303,12 @@ class RecipeTag(models.Model):
                 fields=('recipe', 'tags'),
                 name='unique_recipe_tags')
         ]
+        indexes = [
+            models.Index(
+                fields=('tags', 'recipe'),
+                name='recipetag_tags_recipe_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.recipe} - {self.tags}'
@@ -185,6 +327,8 @@ class Favorite(models.Model):
         verbose_name='Избранные рецепты'
     )
 
+    objects = UserRecipeQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -211,6 +355,8 @@ class ShoppingList(models.Model):
         verbose_name='Рецепты в списке покупок',
     )
 
+    objects = UserRecipeQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from recipes.counters import change_counter, change_recipe_counters
+from recipes.models import Favorite, Recipe, ShoppingList
+from users.models import User
+
+
+def change_recipe_counter(instance, delta):
+    change_recipe_counters(type(instance), (instance.recipe_id,), delta)
+
+
+def change_recipes_count(author_id, delta):
+    change_counter(User.objects.filter(pk=author_id), 'recipes_count', delta)
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=ShoppingList)
+def increment_recipe_counter(instance, created, **kwargs):
+    if created:
+        change_recipe_counter(instance, 1)
+
+
+@receiver(post_delete, sender=Favorite)
+@receiver(post_delete, sender=ShoppingList)
+def decrement_recipe_counter(instance, **kwargs):
+    change_recipe_counter(instance, -1)
+
+
+@receiver(pre_save, sender=Recipe)
+def remember_previous_author(instance, raw=False, **kwargs):
+    instance._previous_author_id = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_author_id = Recipe.objects.filter(
+        pk=instance.pk
+    ).values_list('author_id', flat=True).first()
+
+
+@receiver(post_save, sender=Recipe)
+def increment_recipes_count(instance, created, **kwargs):
+    if created:
+        change_recipes_count(instance.author_id, 1)
+        return
+    previous = getattr(instance, '_previous_author_id', None)
+    if previous is not None and previous != instance.author_id:
+        change_recipes_count(previous, -1)
+        change_recipes_count(instance.author_id, 1)
+
+
+@receiver(post_delete, sender=Recipe)
+def decrement_recipes_count(instance, **kwargs):
+    change_recipes_count(instance.author_id, -1)
@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Ingredient, Recipe, RecipeIngredient, Tag
+from users.models import User
+
+URL = '/admin/recipes/recipe/'
+# Сессия, пользователь, COUNT страницы, рецепты с авторами, теги,
+# ингредиенты и значения фильтра по тегам.
+CHANGELIST_QUERIES = 7
+
+
+class RecipeAdminTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            email='admin@example.com',
+            username='admin',
+            password='password'
+        )
+        cls.author = User.objects.create_user(
+            email='author@example.com',
+            username='borshchevik',
+            password='password'
+        )
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(3)
+        ]
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}', measurement_unit='г'
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def create_recipes(self, total, name='Рецепт', author=None):
+        for number in range(total):
+            recipe = Recipe.objects.create(
+                author=author or self.admin,
+                name=f'{name} {number}',
+                image='recipes_images/recipe.png',
+                text='Описание',
+                cooking_time=10
+            )
+            recipe.tags.set(self.tags)
+            RecipeIngredient.objects.bulk_create(
+                RecipeIngredient(
+                    recipe=recipe, ingredient=ingredient, amount=1
+                )
+                for ingredient in self.ingredients
+            )
+
+    def count_changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(URL, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.create_recipes(5)
+        self.assertEqual(self.count_changelist_queries(), CHANGELIST_QUERIES)
+        self.create_recipes(95)
+        with self.assertNumQueries(CHANGELIST_QUERIES):
+            self.client.get(URL)
+
+    def search(self, term):
+        response = self.client.get(URL, {'q': term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(
+            recipe.name for recipe in response.context['cl'].result_list
+        )
+
+    def test_search_by_whole_name_prefix(self):
+        Recipe.objects.create(
+            author=self.admin,
+            name='Борщ украинский',
+            image='recipes_images/recipe.png',
+            text='Описание',
+            cooking_time=10
+        )
+        self.create_recipes(2, name='Суп')
+        self.assertEqual(self.search('Борщ украинский'), ['Борщ украинский'])
+        self.assertEqual(self.search('Борщ'), ['Борщ украинский'])
+        self.assertEqual(self.search('украинский'), [])
+
+    def test_search_by_author_name_prefix(self):
+        self.create_recipes(2, name='Суп', author=self.author)
+        self.create_recipes(1, name='Салат')
+        self.assertEqual(self.search('borshch'), ['Суп 0', 'Суп 1'])
@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from recipes.models import Favorite, Recipe
+from users.models import Subscription, User
+
+
+class CounterTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first, cls.second = (
+            User.objects.create_user(
+                email=f'user{number}@example.com',
+                username=f'user{number}',
+                password='password'
+            )
+            for number in range(2)
+        )
+
+    def create_recipe(self):
+        return Recipe.objects.create(
+            author=self.first,
+            name='Рецепт',
+            image='recipes_images/recipe.png',
+            text='Описание',
+            cooking_time=10
+        )
+
+    def recipes_count(self):
+        return [
+            User.objects.get(pk=user.pk).recipes_count
+            for user in (self.first, self.second)
+        ]
+
+    def test_author_change_moves_recipes_count(self):
+        recipe = self.create_recipe()
+        recipe.author = self.second
+        recipe.save()
+        self.assertEqual(self.recipes_count(), [0, 1])
+        recipe.delete()
+        self.assertEqual(self.recipes_count(), [0, 0])
+
+    def test_decrement_never_goes_below_zero(self):
+        recipe = self.create_recipe()
+        Favorite.objects.create(user=self.second, recipe=recipe)
+        Subscription.objects.create(user=self.second, author=self.first)
+        User.objects.update(recipes_count=0, subscribers_count=0)
+        Recipe.objects.update(favorites_count=0)
+        Favorite.objects.all().delete()
+        Subscription.objects.all().delete()
+        self.assertEqual(Recipe.objects.get(pk=recipe.pk).favorites_count, 0)
+        recipe.delete()
+        self.assertEqual(self.recipes_count(), [0, 0])
+        self.assertEqual(
+            User.objects.get(pk=self.first.pk).subscribers_count, 0
+        )
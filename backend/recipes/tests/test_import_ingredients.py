@@ -0,0 +1,43 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.cache import INGREDIENTS, get_version
+from recipes.models import Ingredient
+
+LOCAL_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+class ImportIngredientsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def import_ingredients(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'import_ingredients_csv', *args, stdout=stdout, stderr=stderr
+        )
+        return stderr.getvalue()
+
+    def test_import_bumps_ingredients_version(self):
+        version = get_version(INGREDIENTS)
+        self.assertEqual(self.import_ingredients(), '')
+        self.assertTrue(Ingredient.objects.exists())
+        self.assertNotEqual(get_version(INGREDIENTS), version)
+
+    def test_dry_run_keeps_version(self):
+        version = get_version(INGREDIENTS)
+        self.import_ingredients('--dry-run')
+        self.assertFalse(Ingredient.objects.exists())
+        self.assertEqual(get_version(INGREDIENTS), version)
+
+    @override_settings(CACHES=LOCAL_CACHE)
+    def test_warns_about_process_local_cache(self):
+        self.assertIn('перезапустите backend', self.import_ingredients())
@@ -0,0 +1,34 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from recipes.models import Ingredient
+
+UPPER_NAME_INDEX = 'recipes_ingredient_upper_name_like'
+TRIGRAM_NAME_INDEX = 'recipes_ingredient_upper_name_trgm'
+
+
+@skipUnless(
+    connection.vendor == 'postgresql', 'Индексы создаются только в PostgreSQL'
+)
+class IngredientSearchIndexTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Ингредиент {number:04}', measurement_unit='г')
+            for number in range(1000)
+        )
+
+    def test_istartswith_uses_upper_name_index(self):
+        with connection.cursor() as cursor:
+            # На маленькой таблице планировщик иначе выберет seq scan.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = Ingredient.objects.filter(
+            name__istartswith='ингредиент 001'
+        ).order_by().explain()
+        self.assertNotIn('Seq Scan', plan)
+        self.assertTrue(
+            UPPER_NAME_INDEX in plan or TRIGRAM_NAME_INDEX in plan, plan
+        )
@@ -0,0 +1,97 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe, Tag
+from users.models import User
+
+SEARCH_VECTOR_INDEX = 'recipes_recipe_search_vector_gin'
+
+
+class RecipeSearchTest(TestCase):
+    """Выполняется и на SQLite (FTS5), и на PostgreSQL (tsvector)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            email='author@example.com', username='author', password='password'
+        )
+        cls.tag = Tag.objects.create(name='Обед', slug='lunch')
+        cls.recipes = {
+            key: Recipe.objects.create(
+                author=cls.author,
+                name=name,
+                text=text,
+                image='recipes_images/recipe.png',
+                cooking_time=10
+            )
+            for key, name, text in (
+                ('borscht', 'Борщ и свекла', 'Сварить бульон.'),
+                ('salad', 'Винегрет', 'Добавить вареные свекла и лук.'),
+                ('soup', 'Суп из чечевицы', 'Сварить.'),
+            )
+        }
+        cls.recipes['salad'].tags.add(cls.tag)
+
+    def search(self, query):
+        return [recipe.pk for recipe in Recipe.objects.search(query)]
+
+    def test_matches_name_and_text_ranking_name_first(self):
+        self.assertEqual(
+            self.search('свекла'),
+            [self.recipes['borscht'].pk, self.recipes['salad'].pk]
+        )
+
+    def test_no_match_and_empty_query(self):
+        self.assertEqual(self.search('пицца'), [])
+        self.assertEqual(self.search('!!!'), [])
+
+    def test_index_follows_updates(self):
+        soup = self.recipes['soup']
+        soup.name = 'Суп из тыквы'
+        soup.save()
+        self.assertEqual(self.search('тыквы'), [soup.pk])
+        self.assertEqual(self.search('чечевицы'), [])
+
+    def test_combines_with_filters_and_pagination(self):
+        response = APIClient().get(
+            '/api/recipes/', {'search': 'свекла', 'tags': 'lunch', 'limit': 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(
+            response.data['results'][0]['id'], self.recipes['salad'].pk
+        )
+
+
+@skipUnless(
+    connection.vendor == 'postgresql', 'GIN-индекс есть только в PostgreSQL'
+)
+class RecipeSearchIndexTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recipe = Recipe.objects.create(
+            author=User.objects.create_user(
+                email='author@example.com',
+                username='author',
+                password='password'
+            ),
+            name='Борщ со свеклой',
+            text='Сварить бульон.',
+            image='recipes_images/recipe.png',
+            cooking_time=10
+        )
+
+    def test_russian_stemming(self):
+        self.assertEqual(
+            list(Recipe.objects.search('свекла')), [self.recipe]
+        )
+
+    def test_search_uses_gin_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = Recipe.objects.search('свекла').explain()
+        self.assertIn(SEARCH_VECTOR_INDEX, plan)
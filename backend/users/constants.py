@@ -1,3 +1,4 @@
 USERNAME_MAX_LENGTH = 150
 EMAIL_MAX_LENGTH = 254
 PASSWORD_MAX_LENGTH = 254
+AVATAR_NAME_MAX_LENGTH = 100
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:37
+
+import os
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+# Имя первой уменьшенной копии, см. api.images.derivative_name.
+FIRST_DERIVATIVE = '_320.webp'
+
+
+def mark_existing_derivatives(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    for pk, name in User.objects.exclude(avatar='').exclude(
+        avatar__isnull=True
+    ).values_list('pk', 'avatar').iterator():
+        derivative = os.path.splitext(name)[0] + FIRST_DERIVATIVE
+        if default_storage.exists(derivative):
+            User.objects.filter(pk=pk).update(avatar_derivatives=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='avatar_derivatives',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='Уменьшенные копии созданы для'),
+        ),
+        migrations.RunPython(
+            mark_existing_derivatives, migrations.RunPython.noop
+        ),
+    ]
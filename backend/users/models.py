@@ -2,6 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 
 from users.constants import (
+    AVATAR_NAME_MAX_LENGTH,
     EMAIL_MAX_LENGTH,
     PASSWORD_MAX_LENGTH,
     USERNAME_MAX_LENGTH
@@ -39,9 +40,26 @@ class User(AbstractUser):
     avatar = models.ImageField(
         'Фото профиля',
         upload_to='avatars/',
+        max_length=AVATAR_NAME_MAX_LENGTH,
         null=True,
         blank=True
     )
+    avatar_derivatives = models.CharField(
+        'Уменьшенные копии созданы для',
+        max_length=AVATAR_NAME_MAX_LENGTH,
+        blank=True,
+        editable=False
+    )
+    recipes_count = models.PositiveIntegerField(
+        'Количество рецептов',
+        default=0,
+        editable=False
+    )
+    subscribers_count = models.PositiveIntegerField(
+        'Количество подписчиков',
+        default=0,
+        editable=False
+    )
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'password', 'first_name', 'last_name']
@@ -0,0 +1,299 @@
+"""Нагрузочный прогон postman-коллекции.
+
+Каждый виртуальный пользователь последовательно выполняет запросы
+коллекции со своим набором переменных: username и email получают
+уникальный суффикс, а id и токены из ответов сохраняются так же, как это
+делают тестовые скрипты коллекции (pm.collectionVariables.set).
+
+Пример:
+    python load_test.py --users 10 --iterations 5 --output result.json
+"""
+import argparse
+import json
+import math
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+COLLECTION = Path(__file__).with_name('foodgram.postman_collection.json')
+UNIQUE_VARIABLES = (
+    'username',
+    'email',
+    'secondUserUsername',
+    'secondUserEmail',
+    'thirdUserUsername',
+    'thirdUserEmail',
+)
+VARIABLE = re.compile(r'{{(\w+)}}')
+LOCAL_VARIABLE = re.compile(
+    r'''const (\w+) = _\.get\(responseData, ["']([\w.]+)["']\)'''
+)
+SET_VARIABLE = re.compile(
+    r'''pm\.collectionVariables\.set\(["'](\w+)["'],\s*(.+?)\);?$'''
+)
+RESPONSE_PATH = re.compile(r'^responseData((?:\[\d+\]|\.\w+)+)')
+SLICE = re.compile(r'\.slice\((\d+),\s*(\d+)\)$')
+EXPECTED_STATUS = re.compile(r'должен быть (\d{3})')
+TIMEOUT = 30
+
+
+def parse_capture(script):
+    """Правила сохранения переменных: имя -> (путь в ответе, срез)."""
+    local = dict(LOCAL_VARIABLE.findall(script))
+    captures = {}
+    for line in script.splitlines():
+        match = SET_VARIABLE.search(line.strip())
+        if match is None:
+            continue
+        name, expression = match.groups()
+        if expression in local:
+            captures[name] = (local[expression].split('.'), None)
+            continue
+        cut = SLICE.search(expression)
+        if cut:
+            expression = expression[:cut.start()]
+        path = RESPONSE_PATH.match(expression)
+        if path is None:
+            continue
+        captures[name] = (
+            re.findall(r'\w+', path.group(1)),
+            (int(cut.group(1)), int(cut.group(2))) if cut else None
+        )
+    return captures
+
+
+def flatten(items, folder='', auth=None):
+    for item in items:
+        name = f'{folder}/{item["name"]}' if folder else item['name']
+        item_auth = item.get('auth') or auth
+        if 'item' in item:
+            yield from flatten(item['item'], name, item_auth)
+            continue
+        request = item['request']
+        script = '\n'.join(
+            line
+            for event in item.get('event', ())
+            if event['listen'] == 'test'
+            for line in event['script']['exec']
+        )
+        expected = EXPECTED_STATUS.search(script)
+        yield {
+            'name': name,
+            'method': request['method'],
+            'url': request['url']['raw'],
+            'headers': [
+                (header['key'], header['value'])
+                for header in request.get('header', ())
+                if not header.get('disabled')
+            ],
+            'auth': request.get('auth') or item_auth,
+            'body': (request.get('body') or {}).get('raw'),
+            'expected': int(expected.group(1)) if expected else None,
+            'captures': parse_capture(script),
+        }
+
+
+def load_collection(path):
+    with open(path, encoding='utf8') as file:
+        collection = json.load(file)
+    variables = {
+        variable['key']: variable['value']
+        for variable in collection.get('variable', ())
+    }
+    steps = list(flatten(collection['item'], auth=collection.get('auth')))
+    return steps, variables
+
+
+def make_unique(variables, tag):
+    variables = dict(variables)
+    for key in UNIQUE_VARIABLES:
+        if key not in variables:
+            continue
+        value = variables[key].strip('"')
+        if '@' in value:
+            local, domain = value.split('@', 1)
+            value = f'{local}.{tag}@{domain}'
+        else:
+            value = f'{value}-{tag}'
+        variables[key] = f'"{value}"'
+    return variables
+
+
+def substitute(text, variables):
+    return VARIABLE.sub(
+        lambda match: str(variables.get(match.group(1), match.group(0))),
+        text
+    )
+
+
+def auth_headers(auth, variables):
+    if not auth or auth.get('type') != 'apikey':
+        return {}
+    options = {option['key']: option['value'] for option in auth['apikey']}
+    return {options['key']: substitute(options['value'], variables)}
+
+
+def extract(data, path, cut):
+    for key in path:
+        data = data[int(key)] if isinstance(data, list) else data[key]
+    if cut is not None:
+        data = data[cut[0]:cut[1]]
+    return data
+
+
+def send(step, variables):
+    url = substitute(step['url'], variables)
+    headers = {
+        key: substitute(value, variables) for key, value in step['headers']
+    }
+    headers.update(auth_headers(step['auth'], variables))
+    body = None
+    if step['body'] is not None:
+        body = substitute(step['body'], variables).encode()
+        headers.setdefault('Content-Type', 'application/json')
+    request = urllib.request.Request(
+        url, data=body, headers=headers, method=step['method']
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+    except OSError:
+        return 0, b''
+
+
+def run_user(steps, variables, number, iterations, run_id):
+    results = []
+    for iteration in range(iterations):
+        scope = make_unique(variables, f'{run_id}-{number}-{iteration}')
+        for index, step in enumerate(steps):
+            started = time.perf_counter()
+            status, content = send(step, scope)
+            elapsed = time.perf_counter() - started
+            results.append((index, status, elapsed))
+            if not step['captures'] or not 200 <= status < 300:
+                continue
+            try:
+                data = json.loads(content)
+                for name, (path, cut) in step['captures'].items():
+                    scope[name] = extract(data, path, cut)
+            except (ValueError, KeyError, IndexError, TypeError):
+                pass
+    return results
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+def summarize(steps, results, elapsed):
+    report = []
+    for index, step in enumerate(steps):
+        timings = [item[2] for item in results if item[0] == index]
+        statuses = [item[1] for item in results if item[0] == index]
+        if not timings:
+            continue
+        errors = sum(1 for status in statuses if status == 0 or status >= 500)
+        unexpected = sum(
+            1 for status in statuses
+            if step['expected'] and status != step['expected']
+        )
+        report.append({
+            'name': step['name'],
+            'method': step['method'],
+            'requests': len(timings),
+            'throughput_rps': round(len(timings) / elapsed, 2),
+            'p50_ms': round(percentile(timings, 50) * 1000, 2),
+            'p95_ms': round(percentile(timings, 95) * 1000, 2),
+            'error_rate': round(errors / len(timings), 4),
+            'unexpected_status_rate': round(unexpected / len(timings), 4),
+            'statuses': {
+                str(status): statuses.count(status)
+                for status in sorted(set(statuses))
+            },
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--collection', default=COLLECTION)
+    parser.add_argument(
+        '--base-url',
+        help='Адрес сервера, по умолчанию baseUrl из коллекции'
+    )
+    parser.add_argument(
+        '--users', type=int, default=5, help='Виртуальные пользователи'
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=1,
+        help='Прогонов коллекции на пользователя'
+    )
+    parser.add_argument(
+        '--folder',
+        help='Выполнять только запросы, путь которых начинается с этой папки'
+    )
+    parser.add_argument('--output', help='Файл для результатов в JSON')
+    args = parser.parse_args()
+
+    steps, variables = load_collection(args.collection)
+    if args.base_url:
+        variables['baseUrl'] = args.base_url
+    if args.folder:
+        steps = [step for step in steps if step['name'].startswith(
+            args.folder
+        )]
+        if not steps:
+            parser.error(f'в коллекции нет запросов в папке {args.folder!r}')
+    run_id = format(int(time.time()), 'x')
+    lock = threading.Lock()
+    results = []
+
+    def worker(number):
+        user_results = run_user(
+            steps, variables, number, args.iterations, run_id
+        )
+        with lock:
+            results.extend(user_results)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.users) as pool:
+        list(pool.map(worker, range(args.users)))
+    elapsed = time.perf_counter() - started
+
+    report = summarize(steps, results, elapsed)
+    for item in report:
+        print(
+            f'{item["method"]:6} {item["name"][:70]:70} '
+            f'{item["throughput_rps"]:8.2f} rps '
+            f'p50={item["p50_ms"]:8.2f} мс '
+            f'ошибки={item["error_rate"]:.1%} '
+            f'неожиданный статус={item["unexpected_status_rate"]:.1%}'
+        )
+    total = len(results)
+    errors = sum(1 for _, status, _ in results if status == 0 or status >= 500)
+    print(
+        f'Всего запросов: {total} за {elapsed:.1f} с '
+        f'({total / elapsed:.1f} rps), ошибок: {errors / total:.1%}'
+    )
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as file:
+            json.dump({
+                'users': args.users,
+                'iterations': args.iterations,
+                'elapsed': round(elapsed, 2),
+                'requests': total,
+                'results': report,
+            }, file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()